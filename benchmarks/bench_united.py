@@ -0,0 +1,173 @@
+"""Benchmark suite for `united`.
+
+Measures unit construction, arithmetic, representation, equality and the
+conversion search under every priority of ``priority_dict``. The peak
+memory allocated by a single call of every benchmark is measured with
+``tracemalloc``. The results are written as JSON and can be compared against
+a saved baseline. The suite runs as a module from the root of the
+repository::
+
+    $ python -m benchmarks.bench_united --output baseline.json
+    $ python -m benchmarks.bench_united --compare baseline.json
+
+The comparison exits with status 1 if any benchmark got slower than the
+allowed tolerance. Allocations are reported but not compared.
+"""
+import argparse
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+
+import united.united as ud
+
+
+def _cases(priority):
+    """Returns the benchmark cases for a priority as a dict of name to
+    callable."""
+    volt = ud.Unit(["V"])
+    ampere = ud.Unit(["A"])
+    second = ud.Unit(["s"])
+    long_numerators = [ud.m, ud.kg, ud.cd, ud.mol, ud.K] * 4
+    long_denominators = [ud.s, ud.A, ud.rad] * 5
+    worst_case = ud.dimension_of([ud.m] * 6 + [ud.kg] * 3,
+                                 [ud.s] * 9 + [ud.A] * 3)
+    matcher = ud.look_up_table(priority).matcher
+
+    def repr_uncached():
+        ud.simplification_cache.clear()
+        return repr(ud.Unit._from_dimension(worst_case))
+
+    def construct_new():
+        # Units which are not interned yet
+        ud._interned_units.clear()
+        return ud.Unit._from_dimension(worst_case)
+
+    return {
+        "construct_base": lambda: ud.Unit(["m", "kg"], ["s", "s"]),
+        "construct_derived": lambda: ud.Unit(["V"], ["A"]),
+        "construct_new": construct_new,
+        "multiply_chain": lambda: volt * ampere * second / ampere / volt,
+        "divide": lambda: volt / ampere,
+        "power_positive": lambda: volt ** 20,
+        "power_negative": lambda: volt ** -20,
+        "repr_resolved": lambda: repr(volt * ampere),
+        "repr_uncached": repr_uncached,
+        "convert_fraction_to_string": lambda: ud.convert_fraction_to_string(
+            long_numerators, long_denominators),
+        "equality": lambda: volt == ampere,
+        "conversion_search": lambda: matcher.simplify(worst_case),
+        "parse": lambda: ud.Unit.parse("kg*m^2/(s^3*A)"),
+    }
+
+
+def run(number=10000, repeat=5):
+    """Runs all benchmarks and returns the results as a dict.
+
+    Every result is the best time of ``repeat`` runs in seconds per call.
+
+    Args:
+        number (int): Number of calls per run.
+        repeat (int): Number of runs.
+    """
+    results = {}
+    previous_priority = ud.Unit.conversion_priority
+    try:
+        for priority in ud.priority_dict:
+            ud.Unit.conversion_priority = priority
+            for name, case in _cases(priority).items():
+                times = timeit.repeat(case, number=number, repeat=repeat)
+                results["{}[{}]".format(name, priority)] = \
+                    min(times) / number
+    finally:
+        ud.Unit.conversion_priority = previous_priority
+    return {"python": platform.python_version(), "results": results}
+
+
+def allocations(repeat=5):
+    """Measures the memory allocated by the benchmarks and returns it as a
+    dict.
+
+    Every result is the smallest peak of traced memory in bytes during a
+    single call, measured after a warm up call.
+
+    Args:
+        repeat (int): Number of measured calls.
+    """
+    results = {}
+    previous_priority = ud.Unit.conversion_priority
+    tracemalloc.start()
+    try:
+        for priority in ud.priority_dict:
+            ud.Unit.conversion_priority = priority
+            for name, case in _cases(priority).items():
+                case()
+                peaks = []
+                for _ in range(repeat):
+                    tracemalloc.reset_peak()
+                    before = tracemalloc.get_traced_memory()[0]
+                    result = case()
+                    peaks.append(tracemalloc.get_traced_memory()[1] - before)
+                    del result
+                results["{}[{}]".format(name, priority)] = min(peaks)
+    finally:
+        tracemalloc.stop()
+        ud.Unit.conversion_priority = previous_priority
+    return results
+
+
+def compare(current, baseline, tolerance=0.2):
+    """Returns the benchmarks which got slower than the tolerance.
+
+    Args:
+        current (dict): Results of :func:`run`.
+        baseline (dict): Saved results of :func:`run`.
+        tolerance (float): Allowed relative slowdown.
+
+    Returns:
+        dict: Maps the benchmark name to the relative change.
+    """
+    regressions = {}
+    for name, seconds in current["results"].items():
+        reference = baseline["results"].get(name)
+        if reference:
+            change = seconds / reference - 1
+            if change > tolerance:
+                regressions[name] = change
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="File to write the results to.")
+    parser.add_argument("--compare", help="Baseline file to compare with.")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed relative slowdown.")
+    parser.add_argument("--number", type=int, default=10000,
+                        help="Number of calls per run.")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Number of runs.")
+    args = parser.parse_args(argv)
+
+    current = run(args.number, args.repeat)
+    current["allocations"] = allocations(args.repeat)
+    for name, seconds in sorted(current["results"].items()):
+        print("{:<45} {:>10.3f} µs {:>8} B".format(
+            name, seconds * 1e6, current["allocations"][name]))
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(current, output_file, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(current, baseline, args.tolerance)
+        for name, change in sorted(regressions.items()):
+            print("Regression {}: {:+.1%}".format(name, change))
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
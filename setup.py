@@ -32,6 +32,12 @@ setup(
     install_requires=[
     ],
 
+    # Optional dependencies
+    extras_require={
+        'numpy': ['numpy'],
+        'pandas': ['pandas'],
+    },
+
     # Python version requirement
     python_requires='>=3',
 
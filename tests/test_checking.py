@@ -0,0 +1,95 @@
+"""Tests for `united.checking` module."""
+import pytest
+
+import united.united as ud
+from united import Quantity, check_units
+from united import checking
+
+
+def test_check_units():
+    @check_units(voltage="V", current=ud.Unit(["A"]), returns="W")
+    def power(voltage, current, factor=1):
+        return voltage * current * factor
+
+    volt = ud.Unit(["V"])
+    ampere = ud.Unit(["A"])
+    assert power(Quantity(2, volt), Quantity(3, ampere)).value == 6
+    assert power(Quantity(2, ud.Unit(["mV"])), current=Quantity(3, ampere),
+                 factor=2).value == 12
+    assert power(volt, ampere) == ud.Unit(["W"])
+    with pytest.raises(ValueError):
+        power(Quantity(2, ampere), Quantity(3, ampere))
+    with pytest.raises(ValueError):
+        power(2, Quantity(3, ampere))
+    with pytest.raises(TypeError):
+        power(Quantity(2, volt))
+    assert power.__name__ == "power"
+
+
+def test_check_returns():
+    @check_units(time="s", returns="Hz")
+    def frequency(time):
+        return time
+
+    with pytest.raises(ValueError):
+        frequency(ud.Unit(["s"]))
+    with pytest.raises(ValueError):
+        check_units(voltage="V")(lambda current: current)
+    with pytest.raises(TypeError):
+        check_units(voltage=1)
+
+
+def test_checking_disabled():
+    def identity(voltage):
+        return voltage
+
+    checked = check_units(voltage="V")(identity)
+    checking.enabled = False
+    try:
+        assert check_units(voltage="V")(identity) is identity
+        assert checked(ud.Unit(["A"])) == ud.Unit(["A"])
+    finally:
+        checking.enabled = True
+    with pytest.raises(ValueError):
+        checked(ud.Unit(["A"]))
+
+
+def test_check_defaults_and_keyword_only():
+    volt = ud.Unit(["V"])
+
+    @check_units(voltage="V")
+    def optional(x, voltage=None):
+        return voltage
+
+    assert optional(1) is None
+    assert optional(1, Quantity(1, volt)).unit == volt
+    with pytest.raises(ValueError):
+        optional(1, voltage=2)
+
+    @check_units(voltage="V")
+    def variadic(*values, voltage):
+        return voltage
+
+    assert variadic(1, 2, voltage=Quantity(1, volt)).unit == volt
+    with pytest.raises(ValueError):
+        variadic(Quantity(1, volt), voltage=Quantity(1, ud.Unit(["A"])))
+
+
+def test_check_variadic():
+    volt = ud.Unit(["V"])
+
+    @check_units(args="V", kwargs="A")
+    def collect(first, *args, **kwargs):
+        return len(args) + len(kwargs)
+
+    assert collect(1) == 0
+    assert collect(1, volt, Quantity(2, ud.Unit(["mV"])),
+                   current=ud.Unit(["A"])) == 3
+    with pytest.raises(ValueError):
+        collect(1, 1, 2)
+    with pytest.raises(ValueError):
+        collect(1, volt, 2)
+    with pytest.raises(ValueError):
+        collect(1, current=volt)
+    # Named arguments are not collected by **kwargs
+    assert collect(first=volt, current=ud.Unit(["A"])) == 1
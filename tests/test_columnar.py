@@ -0,0 +1,46 @@
+"""Tests for `united.columnar` module."""
+import pytest
+
+import united.united as ud
+
+np = pytest.importorskip("numpy")
+from united.columnar import DictionaryEncodedUnits  # noqa: E402
+from united.unit_array import UnitArray  # noqa: E402
+
+
+def test_from_units():
+    ud.Unit.conversion_priority = "default"
+    units = [ud.Unit(["V"]), ud.Unit(["mA"]), ud.Unit(["V"])] * 3
+    encoded = DictionaryEncodedUnits.from_units(units)
+    assert encoded.codes.dtype == np.int32
+    assert list(encoded.codes) == [0, 1, 0] * 3
+    assert encoded.dictionary == [ud.Unit(["V"]), ud.Unit(["mA"])]
+    assert list(encoded.to_units()) == units
+    assert list(encoded.to_unit_array() == ud.Unit(["V"])) == \
+        [True, False, True] * 3
+
+
+def test_from_unit_array():
+    ud.Unit.conversion_priority = "default"
+    array = UnitArray.from_units([ud.Unit(["s"]), ud.Unit(["V"]),
+                                  ud.Unit(["s"])])
+    encoded = DictionaryEncodedUnits.from_unit_array(array)
+    assert len(encoded.dictionary) == 2
+    assert list(encoded.to_unit_array() == array) == [True] * 3
+
+
+def test_metadata():
+    ud.Unit.conversion_priority = "default"
+    units = [ud.Unit(["kHz"]), ud.Unit(["W"]) ** 0.5, ud.Unit(["kHz"])]
+    encoded = DictionaryEncodedUnits.from_units(units)
+    metadata = encoded.to_metadata()
+    assert metadata == {"united.units": '["kHz", "W^(1/2)"]'}
+    decoded = DictionaryEncodedUnits.from_metadata(
+        encoded.codes, {key.encode(): value.encode()
+                        for key, value in metadata.items()})
+    assert decoded == encoded
+    assert list(decoded.to_units()) == units
+    with pytest.raises(ValueError):
+        DictionaryEncodedUnits.from_metadata(encoded.codes, {})
+    with pytest.raises(ValueError):
+        DictionaryEncodedUnits([0, 2], [ud.Unit(["V"])])
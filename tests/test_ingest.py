@@ -0,0 +1,49 @@
+"""Tests for `united.ingest` module."""
+import pytest
+
+import united
+import united.united as ud
+
+
+def test_parse_many():
+    ud.Unit.conversion_priority = "default"
+    labels = ["V", "A", "kg*m^2/(s^3*A)", "V", "A"] * 100
+    parser = united.LabelParser()
+    units = list(united.parse_many(labels, parser))
+    assert len(units) == 500
+    assert units[0] is units[2] is ud.Unit(["V"])
+    assert units[1] is ud.Unit(["A"])
+    info = parser.info()
+    assert info["labels"] == 500
+    assert info["parsed"] == 3
+    assert info["distinct_units"] == 2
+
+
+def test_encode():
+    parser = united.LabelParser()
+    codes = list(parser.encode(["V", "A", "V", "W/A"]))
+    assert codes == [0, 1, 0, 0]
+    assert parser.units == [ud.Unit(["V"]), ud.Unit(["A"])]
+
+
+def test_bounded_memo():
+    parser = united.LabelParser(maxsize=2)
+    list(parser.encode(["V", "A", "s", "V"]))
+    info = parser.info()
+    assert info["parsed"] == 4
+    assert info["evictions"] == 2
+    with pytest.raises(ValueError):
+        parser.parse("x")
+
+
+def test_bounded_codes():
+    parser = united.LabelParser(max_units=2)
+    assert list(parser.encode(["V", "A", "W/A"])) == [0, 1, 0]
+    with pytest.raises(RuntimeError):
+        parser.code("mV")
+    units = parser.units
+    parser.reset()
+    assert units == [ud.Unit(["V"]), ud.Unit(["A"])]
+    assert list(parser.encode(["mV", "V"])) == [0, 1]
+    assert parser.units == [ud.Unit(["mV"]), ud.Unit(["V"])]
+    assert parser.info()["labels"] == 6
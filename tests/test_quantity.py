@@ -0,0 +1,114 @@
+"""Tests for `united.quantity` module."""
+import pytest
+
+import united
+import united.united as ud
+from united import Quantity
+
+
+def test_add():
+    a = Quantity(1.0, ud.Unit(["V"]))
+    b = Quantity(2.0, ud.Unit(["V"]))
+    c = a + b
+    assert c.value == 3.0
+    assert c.unit == ud.Unit(["V"])
+    assert (b - a).value == 1.0
+    with pytest.raises(ValueError):
+        a + Quantity(1.0, ud.Unit(["A"]))
+    with pytest.raises(TypeError):
+        a + 1.0
+
+
+def test_mul_div_pow():
+    ud.Unit.conversion_priority = "default"
+    u = Quantity(2.0, ud.Unit(["V"]))
+    i = Quantity(4.0, ud.Unit(["A"]))
+    p = u * i
+    assert p.value == 8.0
+    assert repr(p.unit) == "W"
+    r = u / i
+    assert r.value == 0.5
+    assert repr(r.unit) == "Ω"
+    assert (u * 3).value == 6.0
+    assert (3 * u).unit == ud.Unit(["V"])
+    assert repr((1 / i).unit) == "1/A"
+    assert repr((u * ud.Unit(["A"])).unit) == "W"
+    assert repr((i ** 2).unit) == "A^2"
+    assert (i ** 0).unit == ud.Unit()
+    assert repr(u) == "2.0 V"
+
+
+def test_compare():
+    a = Quantity(1.0, ud.Unit(["V"]))
+    b = Quantity(2.0, ud.Unit(["V"]))
+    assert a < b
+    assert a == Quantity(1.0, ud.Unit(["V"]))
+    assert not a == Quantity(1.0, ud.Unit(["A"]))
+    with pytest.raises(ValueError):
+        a < Quantity(1.0, ud.Unit(["A"]))
+
+
+def test_array():
+    np = pytest.importorskip("numpy")
+    values = np.arange(5.0)
+    a = Quantity(values, ud.Unit(["V"]))
+    assert a.value is values
+    a += Quantity(np.ones(5), ud.Unit(["V"]))
+    assert a.value is values
+    assert list(values) == [1.0, 2.0, 3.0, 4.0, 5.0]
+    b = np.ones(5) * Quantity(values, ud.Unit(["A"]))
+    assert isinstance(b, Quantity)
+    assert repr((a * b).unit) == "W"
+
+
+def test_unit_operand():
+    ud.Unit.conversion_priority = "default"
+    a = ud.Unit(["V"]) * Quantity(2.0, ud.Unit(["A"]))
+    assert a.value == 2.0
+    assert repr(a.unit) == "W"
+    b = ud.Unit(["V"]) / Quantity(2.0, ud.Unit(["A"]))
+    assert b.value == 0.5
+    assert repr(b.unit) == "Ω"
+
+
+def test_conversion_factor():
+    assert ud.Unit(["mA"]).conversion_factor(ud.Unit(["A"])) == 1e-3
+    assert (ud.Unit(["mA"]) * ud.Unit(["kΩ"])).conversion_factor(
+        ud.Unit(["V"])) == 1
+    assert ud.Unit(["V"]).conversion_factor(ud.Unit(["mV"])) == 1e3
+    assert ud.Unit(["mV"]).is_compatible(ud.Unit(["kV"]))
+    with pytest.raises(ValueError):
+        ud.Unit(["V"]).conversion_factor(ud.Unit(["A"]))
+
+
+def test_convert():
+    a = Quantity(2.0, ud.Unit(["mV"]))
+    b = a.to(ud.Unit(["V"]))
+    assert b.value == pytest.approx(2e-3)
+    assert b.unit == ud.Unit(["V"])
+    assert united.convert(5.0, ud.Unit(["kHz"]), ud.Unit(["Hz"])) == 5000.0
+    with pytest.raises(ValueError):
+        a.to(ud.Unit(["A"]))
+
+
+def test_convert_array():
+    np = pytest.importorskip("numpy")
+    values = np.arange(4.0)
+    assert united.convert(values, ud.Unit(["V"]), ud.Unit(["V"])) is values
+    out = np.empty(4)
+    result = united.convert(values, ud.Unit(["mA"]) * ud.Unit(["kΩ"]),
+                            ud.Unit(["mV"]), out=out)
+    assert result is out
+    assert list(out) == [0.0, 1000.0, 2000.0, 3000.0]
+    a = Quantity(values, ud.Unit(["kV"]))
+    b = a.to(ud.Unit(["V"]), out=values)
+    assert b.value is values
+    assert list(values) == [0.0, 1000.0, 2000.0, 3000.0]
+    # Lists are converted like arrays with and without an output array
+    converted = united.convert([1.0, 2.0], ud.Unit(["kV"]), ud.Unit(["V"]))
+    assert isinstance(converted, np.ndarray)
+    assert list(converted) == [1000.0, 2000.0]
+    assert list(united.convert([1.0, 2.0], ud.Unit(["V"]),
+                               ud.Unit(["V"]))) == [1.0, 2.0]
+    assert list(united.convert([1.0, 2.0], ud.Unit(["kV"]), ud.Unit(["V"]),
+                               out=np.empty(2))) == [1000.0, 2000.0]
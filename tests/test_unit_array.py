@@ -0,0 +1,59 @@
+"""Tests for `united.unit_array` module."""
+import pytest
+
+import united.united as ud
+
+np = pytest.importorskip("numpy")
+from united.unit_array import UnitArray  # noqa: E402
+
+
+def test_from_units():
+    a = UnitArray.from_units([ud.Unit(["V"]), ud.Unit(["s"])])
+    assert a.shape == (2,)
+    assert a[0] == ud.Unit(["V"])
+    assert a[1] == ud.Unit(["s"])
+    with pytest.raises(ValueError):
+        UnitArray(np.zeros((2, 3), dtype=int))
+
+
+def test_arithmetic():
+    ud.Unit.conversion_priority = "default"
+    a = UnitArray.from_units([ud.Unit(["V"]), ud.Unit(["m"])])
+    b = UnitArray.from_units([ud.Unit(["A"]), ud.Unit(["s"])])
+    assert list(a * b == UnitArray.from_units(
+        [ud.Unit(["W"]), ud.Unit(["m", "s"])])) == [True, True]
+    assert list((a / b).reprs()) == ["Ω", "m/s"]
+    assert list((a * ud.Unit(["A"])).reprs()) == ["W", "m*A"]
+    assert list((1 / b).reprs()) == ["1/A", "Hz"]
+    assert list((b ** 2).reprs()) == ["A^2", "s^2"]
+    assert list((b ** np.array([1, -1])).reprs()) == ["A", "Hz"]
+    assert list(a == ud.Unit(["V"])) == [True, False]
+
+
+def test_broadcasting():
+    a = UnitArray.from_units([ud.Unit(["V"]), ud.Unit(["A"])])
+    b = UnitArray(a.dimensions[:, np.newaxis, :])
+    c = a * b
+    assert c.shape == (2, 2)
+    assert c.reprs().tolist() == [["V^2", "W"], ["W", "A^2"]]
+
+
+def test_batched_repr():
+    ud.Unit.conversion_priority = "default"
+    ud.simplification_cache.clear()
+    a = UnitArray(np.tile(np.array(ud.Unit(["V"]).dimension), (1000, 1)))
+    reprs = a.reprs()
+    assert reprs.shape == (1000,)
+    assert set(reprs) == {"V"}
+    assert ud.simplification_cache.info()["misses"] == 1
+    assert set(a.quantities()) == {"Voltage"}
+
+
+def test_scales():
+    ud.Unit.conversion_priority = "default"
+    a = UnitArray.from_units([ud.Unit(["mV"]), ud.Unit(["kΩ"])])
+    assert list(a.scales) == [-3, 3]
+    assert list((a / ud.Unit(["mA"])).reprs()) == ["Ω", "MΩ/A"]
+    assert list(a == ud.Unit(["mV"])) == [True, False]
+    assert a[0] is ud.Unit(["mV"])
+    assert list((a ** 2).scales) == [-6, 6]
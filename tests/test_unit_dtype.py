@@ -0,0 +1,88 @@
+"""Tests for `united.unit_dtype` module."""
+import pytest
+
+import united.united as ud
+from united import Quantity
+
+pd = pytest.importorskip("pandas")
+np = pytest.importorskip("numpy")
+from united.unit_dtype import QuantityArray, UnitDtype  # noqa: E402
+
+
+def test_dtype():
+    ud.Unit.conversion_priority = "default"
+    dtype = UnitDtype(ud.Unit(["V"]))
+    assert dtype.name == "unit[V]"
+    assert UnitDtype.construct_from_string("unit[mV]").unit == \
+        ud.Unit(["mV"])
+    assert pd.api.types.pandas_dtype("unit[V]") == dtype
+    series = pd.Series([1, 2], dtype="unit[kHz]")
+    assert series.dtype.unit == ud.Unit(["kHz"])
+    assert series[1] == Quantity(2, ud.Unit(["kHz"]))
+    with pytest.raises(TypeError):
+        UnitDtype.construct_from_string("float")
+
+
+def test_arithmetic():
+    ud.Unit.conversion_priority = "default"
+    voltage = pd.Series(QuantityArray([1.0, 2.0, 3.0], ud.Unit(["V"])))
+    current = pd.Series(QuantityArray([2.0, 2.0, np.nan], ud.Unit(["A"])))
+    power = voltage * current
+    assert power.dtype == UnitDtype(ud.Unit(["W"]))
+    assert list(power.array.value[:2]) == [2.0, 4.0]
+    assert power.isna().tolist() == [False, False, True]
+    assert (voltage / 2).dtype == voltage.dtype
+    assert (voltage / current).dtype.unit == ud.Unit(["Ohm"])
+    assert (voltage * ud.Unit(["s"])).dtype.unit == ud.Unit(["Wb"])
+    assert (voltage ** 2).dtype.unit == ud.Unit(["V"]) ** 2
+    assert (voltage + voltage).tolist() == [Quantity(x, ud.Unit(["V"]))
+                                            for x in (2.0, 4.0, 6.0)]
+    with pytest.raises(ValueError):
+        voltage + current
+    with pytest.raises(TypeError):
+        voltage + 1
+    assert (voltage > Quantity(1.5, ud.Unit(["V"]))).tolist() == \
+        [False, True, True]
+    assert voltage.sum() == Quantity(6.0, ud.Unit(["V"]))
+    assert voltage.var().unit == ud.Unit(["V"]) ** 2
+
+
+def test_concat_and_merge():
+    ud.Unit.conversion_priority = "default"
+    volts = pd.Series(QuantityArray([1.0, 2.0], ud.Unit(["V"])))
+    millivolts = pd.Series(QuantityArray([5.0], ud.Unit(["mV"])))
+    combined = pd.concat([volts, millivolts], ignore_index=True)
+    assert combined.dtype == volts.dtype
+    assert combined.array.value.tolist() == [1.0, 2.0, 0.005]
+    amperes = pd.Series(QuantityArray([1.0], ud.Unit(["A"])))
+    assert pd.concat([volts, amperes]).dtype == object
+    with pytest.raises(ValueError):
+        QuantityArray._concat_same_type([volts.array, amperes.array])
+    left = pd.DataFrame({"key": [1, 2], "u": volts})
+    right = pd.DataFrame({"key": [2, 3], "i": QuantityArray(
+        [1.0, 2.0], ud.Unit(["A"]))})
+    merged = left.merge(right, on="key", how="outer")
+    assert merged["u"].dtype == volts.dtype
+    assert merged["i"].dtype.unit == ud.Unit(["A"])
+    assert merged["i"].isna().tolist() == [True, False, False]
+    assert volts.astype("unit[mV]").array.value.tolist() == [1000.0, 2000.0]
+    assert volts.array.nbytes == 16
+
+
+def test_mixed_units():
+    ud.Unit.conversion_priority = "default"
+    volt = ud.Unit(["V"])
+    ampere = ud.Unit(["A"])
+    frame = pd.DataFrame({"u": QuantityArray([1.0, 2.0], volt),
+                          "i": QuantityArray([3.0, 4.0], ampere)})
+    assert frame.iloc[0].tolist() == [Quantity(1.0, volt),
+                                      Quantity(3.0, ampere)]
+    assert frame.to_numpy().dtype == object
+    assert frame.values[1, 1] == Quantity(4.0, ampere)
+    assert frame.T.shape == (2, 2)
+    assert len(frame.stack()) == 4
+    assert frame.sum().tolist() == [Quantity(3.0, volt),
+                                    Quantity(7.0, ampere)]
+    assert frame["u"].mean() == Quantity(1.5, volt)
+    assert frame["u"].describe()["count"] == 2
+    assert frame.dtypes.tolist() == [UnitDtype(volt), UnitDtype(ampere)]
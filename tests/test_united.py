@@ -1,4 +1,7 @@
 """Tests for `united` package."""
+import itertools
+from fractions import Fraction
+
 import pytest
 from collections import Counter
 
@@ -176,7 +179,8 @@ def test_fix_repr(numerator, denominator, expected):
 
 
 @pytest.mark.parametrize("numerator, denominator, expected",
-                         [(["s"], [], "Time"), (["V", "A"], [], None)])
+                         [(["s"], [], "Time"), (["V", "A"], [], "Power"),
+                          (["V", "m"], [], None)])
 def test_fix_repr(numerator, denominator, expected):
     ud.Unit.conversion_priority = "default"
     a = ud.Unit(numerator, denominator, fix_repr=True)
@@ -200,4 +204,605 @@ def test_conversion_priority():
 def test_dividers(first_num, first_denom, second_num, second_denom, result):
     ud.Unit.conversion_priority = "default"
     assert ud.check_divider(first_num, first_denom,
-                            second_num, second_denom) == result
\ No newline at end of file
+                            second_num, second_denom) == result
+
+def test_dimension():
+    a = ud.Unit(["V"])
+    assert a.dimension == (0, 2, 1, -3, -1, 0, 0, 0)
+    b = ud.Unit(["kg", "m"])
+    c = ud.Unit(["m", "kg"])
+    assert b.dimension == c.dimension
+    assert repr(b) == repr(c)
+    assert (a * a).dimension == (0, 4, 2, -6, -2, 0, 0, 0)
+    assert (a / a).dimension == (0,) * 8
+    assert ud.dimension_of([ud.m, ud.m], [ud.s]) == (0, 2, 0, -1, 0, 0, 0, 0)
+
+
+def test_simplification_cache():
+    ud.Unit.conversion_priority = "default"
+    cache = ud.simplification_cache
+    cache.clear()
+    repr(ud.Unit(["V"]))
+    repr(ud.Unit(["V"]))
+    info = cache.info()
+    assert info["hits"] == 1
+    assert info["misses"] == 1
+    assert info["size"] == 1
+    ud.Unit.conversion_priority = "mechanical"
+    assert repr(ud.Unit(["V"])) == "J/C"
+    ud.Unit.conversion_priority = "default"
+    assert repr(ud.Unit(["V"])) == "V"
+    cache.resize(1)
+    assert len(cache) == 1
+    assert cache.info()["evictions"] == 1
+    cache.resize(1024)
+    cache.clear()
+    assert cache.info() == {"hits": 0, "misses": 0, "evictions": 0,
+                            "size": 0, "maxsize": 1024}
+
+
+def test_simplification_cache_invalidation():
+    ud.Unit.conversion_priority = "default"
+    assert repr(ud.Unit(["m"], ["s"])) == "m/s"
+    # Keep the resolved unit alive, so it is not created again
+    speed = ud.Unit(["m"], ["s"])
+    assert repr(speed) == "m/s"
+    velocity = ud.NamedUnit("v", "Velocity")
+    ud.conversion_list.append(ud.Conversion((ud.m,), (ud.s,), velocity))
+    ud.default_priority.append(len(ud.conversion_list) - 1)
+    try:
+        assert repr(speed) == "v"
+        assert repr(ud.Unit(["m"], ["s"])) == "v"
+    finally:
+        ud.conversion_list.pop()
+        ud.default_priority.pop()
+    assert repr(speed) == "m/s"
+    assert repr(ud.Unit(["m"], ["s"])) == "m/s"
+
+
+def test_registry_invalidate():
+    registry = ud.default_registry.copy()
+    speed = ud.Unit(["m"], ["s"], priority="default", registry=registry)
+    assert repr(speed) == "m/s"
+    # Resolved units do not check the lists again on every access
+    generation = registry.generation
+    assert repr(speed) == "m/s"
+    assert registry.generation == generation
+    # Conversions replaced in place are noticed after invalidating
+    velocity = ud.NamedUnit("v", "Velocity")
+    registry.conversions[0] = ud.Conversion((ud.m,), (ud.s,), velocity)
+    assert repr(speed) == "m/s"
+    registry.invalidate()
+    assert registry.generation > generation
+    assert repr(speed) == "v"
+    assert ud.Unit.parse("v", registry=registry) == speed
+    with pytest.raises(RuntimeError):
+        registry.freeze().invalidate()
+
+
+def test_lazy_repr():
+    ud.Unit.conversion_priority = "mechanical"
+    a = ud.Unit(["V"])
+    b = a * ud.Unit(["A"])
+    ud.Unit.conversion_priority = "default"
+    assert b._entry is None
+    assert repr(a) == "J/C"
+    assert b._entry is None
+    assert b.quantity == "Power"
+    assert b._entry is None
+    assert repr(b) == "J/s"
+    assert b._entry is not None
+    ud.Unit.lazy = False
+    try:
+        c = ud.Unit(["V"])
+        assert c._entry is not None
+    finally:
+        ud.Unit.lazy = True
+
+
+def greedy_reference(numerators, denominators, look_up_table):
+    """List based conversion search using check_divider."""
+    numerators = list(numerators)
+    denominators = list(denominators)
+    found = True
+    while found:
+        found = False
+        for conversion in look_up_table:
+            if ud.check_divider(conversion.numerators,
+                                conversion.denominators,
+                                numerators, denominators) \
+                    and not conversion.match_exactly:
+                for j in conversion.numerators:
+                    numerators.remove(j)
+                for j in conversion.denominators:
+                    denominators.remove(j)
+                numerators.append(conversion.result)
+                found = True
+                break
+            elif ud.check_divider(conversion.denominators,
+                                  conversion.numerators,
+                                  numerators, denominators) and \
+                    conversion.reciprocal and not conversion.match_exactly:
+                for j in conversion.numerators:
+                    denominators.remove(j)
+                for j in conversion.denominators:
+                    numerators.remove(j)
+                denominators.append(conversion.result)
+                found = True
+                break
+            elif conversion.match_exactly:
+                if ud.check_exact_match(conversion.numerators,
+                                        conversion.denominators,
+                                        numerators, denominators):
+                    numerators = [conversion.result]
+                    denominators = []
+                    found = True
+                    break
+    return numerators, denominators
+
+
+@pytest.mark.parametrize("priority", sorted(ud.priority_dict))
+def test_matcher_equivalence(priority):
+    table = ud.look_up_table(priority)
+    exponents = range(-3, 4)
+    for m, kg, s, a, rad in itertools.product(exponents, exponents,
+                                              exponents, exponents,
+                                              range(-1, 2)):
+        dimension = (rad, m, kg, s, a, 0, 0, 0)
+        unit = ud.Unit._from_dimension(dimension)
+        numerators, denominators = greedy_reference(
+            unit.numerators, unit.denominators, table.table)
+        reduced = table.matcher.simplify(dimension)
+        assert Counter({u: x for u, x in reduced if x > 0}) == \
+            Counter(numerators)
+        assert Counter({u: -x for u, x in reduced if x < 0}) == \
+            Counter(denominators)
+        # The traced search of the instrumentation applies the same rules
+        assert table.matcher._simplify_traced(dimension, []) == \
+            table.matcher._simplify(dimension)
+
+
+def test_interning():
+    ud.Unit.conversion_priority = "default"
+    a = ud.Unit(["V"])
+    b = ud.Unit(["m", "m", "kg"], ["s", "s", "s", "A"])
+    assert a is b
+    assert a * 1 is a
+    assert ud.Unit(["W"]) / ud.Unit(["A"]) is a
+    c = ud.Unit(["V"], fix_repr=True)
+    assert c is not a
+    assert c == a
+    assert hash(c) == hash(a)
+    assert len({a, b, c, ud.Unit(["A"])}) == 2
+    assert {a: 1}[ud.Unit(["J"], ["C"])] == 1
+    with pytest.raises(AttributeError):
+        a.dimension = (0,) * 8
+
+
+@pytest.mark.parametrize("string, expected",
+                         [("s", (["s"], [])), ("V*A", (["W"], [])),
+                          ("kg*m^2/(s^3*A)", (["V"], [])),
+                          ("(m*kg)/(s*cd)", (["m", "kg"], ["s", "cd"])),
+                          ("1/(m*kg)", ([], ["m", "kg"])),
+                          ("Ohm", (["Ω"], [])), ("1/Ω", (["S"], [])),
+                          ("V^-2", ([], ["V", "V"])), ("V^(-2)", ([], ["V", "V"])),
+                          ("m / s", (["m"], ["s"])), ("1", ([], []))])
+def test_parse(string, expected):
+    ud.Unit.conversion_priority = "default"
+    assert ud.Unit.parse(string) == ud.Unit(*expected)
+    assert ud.Unit.from_string(string) is ud.Unit.parse(string)
+
+
+@pytest.mark.parametrize("string", ["x", "V*", "(V", "V)", "V^A", "V$A",
+                                    ""])
+def test_parse_invalid(string):
+    with pytest.raises(ValueError):
+        ud.Unit.parse(string)
+
+
+@pytest.mark.parametrize("priority", sorted(ud.priority_dict))
+def test_parse_round_trip(priority):
+    ud.Unit.conversion_priority = priority
+    exponents = range(-2, 3)
+    for m, kg, s, a in itertools.product(exponents, exponents, exponents,
+                                         exponents):
+        unit = ud.Unit._from_dimension((0, m, kg, s, a, 0, 0, 0))
+        assert ud.Unit.parse(repr(unit)) == unit
+    ud.Unit.conversion_priority = "default"
+
+
+def test_pow_fractional():
+    ud.Unit.conversion_priority = "default"
+    a = ud.Unit(["W"])
+    b = a ** Fraction(1, 2)
+    assert b.dimension == (0, 1, Fraction(1, 2), Fraction(-3, 2), 0, 0, 0, 0)
+    assert repr(b) == "W^(1/2)"
+    assert b ** 2 is a
+    assert a ** 0.5 is b
+    assert repr(ud.Unit(["Hz"]) ** 0.5) == "Hz^(1/2)"
+    c = ud.Unit(["V"]) / ud.Unit(["Hz"]) ** 0.5
+    assert repr(c) == "V/Hz^(1/2)"
+    assert repr(ud.Unit(["A"]) / ud.Unit(["Hz"]) ** 0.5) == "A/Hz^(1/2)"
+    assert repr(ud.Unit(["s"]) ** 0.5) == "s^(1/2)"
+    assert ud.Unit.parse(repr(c)) == c
+    assert ud.Unit.parse("m^(1/2)/s^(-3/2)") == \
+        ud.Unit(["m"]) ** 0.5 * ud.Unit(["s"]) ** 1.5
+    assert b.quantity is None
+    with pytest.raises(ValueError):
+        b.numerators
+
+
+def test_pow_large():
+    a = ud.Unit(["V"])
+    assert (a ** 50).dimension == tuple(50 * x for x in a.dimension)
+    assert (a ** -50).dimension == tuple(-50 * x for x in a.dimension)
+
+
+def test_priority_context():
+    ud.Unit.conversion_priority = "default"
+    with ud.priority_context("mechanical"):
+        assert repr(ud.Unit(["V"])) == "J/C"
+        assert repr(ud.Unit(["V"], priority="default")) == "V"
+        assert repr(ud.Unit.parse("V", priority="default")) == "V"
+        assert repr(ud.Unit(["V"]) * ud.Unit(["A"])) == "J/s"
+    assert repr(ud.Unit(["V"])) == "V"
+    # Results keep the priority shared by the operands
+    volt = ud.Unit(["V"], priority="mechanical")
+    ampere = ud.Unit(["A"], priority="mechanical")
+    assert repr(volt * ampere) == "J/s"
+    assert repr(volt * ud.Unit(["A"])) == "W"
+    assert repr(volt ** 2) == "J^2/C^2"
+    assert repr(1 / volt) == "C/J"
+    with ud.priority_context("mechanical"):
+        assert repr(ud.Unit(["V"], priority="default") *
+                    ud.Unit(["A"], priority="default")) == "W"
+    with pytest.raises(ValueError):
+        with ud.priority_context("Test"):
+            pass
+    with pytest.raises(ValueError):
+        ud.Unit(["V"], priority="Test")
+
+
+def test_priority_context_threads():
+    import threading
+    ud.Unit.conversion_priority = "default"
+    barrier = threading.Barrier(2)
+    results = {}
+
+    def worker(priority):
+        with ud.priority_context(priority):
+            barrier.wait()
+            results[priority] = repr(ud.Unit(["V"]))
+
+    threads = [threading.Thread(target=worker, args=(priority,))
+               for priority in ("default", "mechanical")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == {"default": "V", "mechanical": "J/C"}
+
+
+def test_priority_context_asyncio():
+    import asyncio
+    ud.Unit.conversion_priority = "default"
+
+    async def task(priority):
+        with ud.priority_context(priority):
+            await asyncio.sleep(0)
+            return repr(ud.Unit(["V"]))
+
+    async def main():
+        return await asyncio.gather(task("mechanical"), task("default"))
+
+    assert asyncio.run(main()) == ["J/C", "V"]
+
+
+def test_registry():
+    ud.Unit.conversion_priority = "default"
+    registry = ud.default_registry.copy()
+    velocity = registry.define("v", "Velocity", "m/s")
+    assert registry.units["v"] is velocity
+    assert registry.symbol_dimensions["v"] == (0, 1, 0, -1, 0, 0, 0, 0)
+    a = ud.Unit(["m"], ["s"], registry=registry)
+    assert repr(a) == "v"
+    assert a.quantity == "Velocity"
+    assert a.registry is registry
+    assert repr(ud.Unit.parse("v*s", registry=registry)) == "m"
+    assert repr(a * ud.Unit(["s"])) == "m"
+    b = ud.Unit(["m"], ["s"])
+    assert repr(b) == "m/s"
+    assert a == b
+    assert a is not b
+    assert "v" not in ud.symbol_dimensions
+    with pytest.raises(ValueError):
+        ud.Unit.parse("v")
+    # Only powers of ten are supported as factors
+    with pytest.raises(ValueError):
+        registry.define("Wh", "Energy", "3600*J")
+    assert "Wh" not in registry.units
+    # Unknown symbols are not dropped
+    for names in (["mohm"], ["foo"], ["m", "foo"]):
+        with pytest.raises(ValueError):
+            ud.Unit(names)
+        with pytest.raises(ValueError):
+            ud.Unit(["s"], names, fix_repr=True)
+    # Scaled units are kept by copies
+    registry.define("bar", "Pressure", "10^5*Pa")
+    copy = registry.copy()
+    assert ud.Unit.parse("bar", registry=copy) == \
+        ud.Unit.parse("bar", registry=registry)
+    assert ud.Unit(["bar"], registry=copy).scale == 5
+
+
+def test_frozen_registry():
+    ud.Unit.conversion_priority = "default"
+    registry = ud.default_registry.copy()
+    registry.define("v", "Velocity", "m/s", priorities=["mechanical"])
+    registry.freeze()
+    assert registry.frozen
+    assert isinstance(registry.conversions, tuple)
+    with pytest.raises(RuntimeError):
+        registry.define("x", "Test", "m")
+    assert repr(ud.Unit(["m"], ["s"], registry=registry)) == "m/s"
+    assert repr(ud.Unit(["m"], ["s"], registry=registry,
+                        priority="mechanical")) == "v"
+    assert registry.look_up_table("default") is \
+        registry.look_up_table("default")
+    with pytest.raises(ValueError):
+        ud.Unit(["m"], registry=registry, priority="Test")
+    empty = ud.UnitRegistry()
+    with pytest.raises(ValueError, match="Unknown unit 'V'"):
+        ud.Unit(["V"], registry=empty)
+    assert repr(ud.Unit(["m", "kg"], registry=empty)) == "m*kg"
+
+
+@pytest.mark.parametrize("string, scale, expected",
+                         [("mV", -3, "mV"), ("kHz", 3, "kHz"),
+                          ("µA", -6, "µA"), ("uA", -6, "µA"),
+                          ("GΩ", 9, "GΩ"), ("MOhm", 6, "MΩ"),
+                          ("1/ms", 3, "kHz"), ("mV/A", -3, "mΩ"),
+                          ("mg", -6, "mg"), ("g", -3, "g"),
+                          ("10^-3*kg", -3, "g"), ("km^2", 6, "km^2"),
+                          ("1/mA", 3, "1/mA"), ("10^5*Pa", 5, "10^5*Pa"),
+                          ("mV*mA", -6, "µW"), ("mA*kΩ", 0, "V"),
+                          ("10^3", 3, "10^3"), ("1/(m*kg)*10^3", 3,
+                                                "1/(mm*kg)")])
+def test_prefixes(string, scale, expected):
+    ud.Unit.conversion_priority = "default"
+    a = ud.Unit.parse(string)
+    assert a.scale == scale
+    assert repr(a) == expected
+    assert ud.Unit.parse(repr(a)) == a
+
+
+def test_prefix_arithmetic():
+    ud.Unit.conversion_priority = "default"
+    a = ud.Unit(["mV"])
+    assert a.dimension == ud.Unit(["V"]).dimension
+    assert a != ud.Unit(["V"])
+    assert a.quantity == "Voltage"
+    assert (a * ud.Unit(["kΩ"], ["V", "V"])).scale == 0
+    assert (a / ud.Unit(["mA"])) == ud.Unit(["Ω"])
+    assert (a ** 2).scale == -6
+    assert repr(a ** -1) == "1/mV"
+    assert (1 / a).scale == 3
+    assert repr(a ** 0.5) == "10^(-3/2)*V^(1/2)"
+    assert ud.Unit(["mm"]) != ud.Unit(["m"])
+    assert ud.Unit(["Pa"]).scale == 0
+    assert ud.Unit(["cd"]).scale == 0
+    assert ud.Unit(["T"]).scale == 0
+    with pytest.raises(ValueError):
+        a + ud.Unit(["V"])
+
+
+def test_serialization():
+    import pickle
+    ud.Unit.conversion_priority = "default"
+    a = ud.Unit(["mV"], ["s"])
+    data = a.to_bytes()
+    assert len(data) == 12
+    assert ud.Unit.from_bytes(data) is a
+    b = ud.Unit(["W"]) ** 0.5
+    assert ud.Unit.from_bytes(b.to_bytes()) is b
+    c = ud.Unit(["V"]) ** 100
+    assert len(c.to_bytes()) == 21
+    assert ud.Unit.from_bytes(c.to_bytes()) is c
+    d = ud.Unit(["V"], priority="mechanical")
+    assert repr(ud.Unit.from_bytes(d.to_bytes())) == "J/C"
+    assert pickle.loads(pickle.dumps(a)) is a
+    assert pickle.loads(pickle.dumps(d)) is d
+    e = pickle.loads(pickle.dumps(ud.Unit(["V"], ["A"], fix_repr=True)))
+    assert repr(e) == "V/A"
+    assert e.reduced_numerators[0] is ud.V
+    assert pickle.loads(pickle.dumps(ud.V)) is ud.V
+    with pytest.raises(ValueError):
+        ud.Unit.from_bytes(b"\x01\x00")
+    # Unknown priority and zero denominator
+    with pytest.raises(ValueError, match="Invalid unit encoding"):
+        ud.Unit.from_bytes(b"\x01\x09\x01" + bytes(9))
+    with pytest.raises(ValueError, match="Invalid unit encoding"):
+        ud.Unit.from_bytes(b"\x01\x00\x00" + bytes(9))
+
+
+def test_bulk_serialization():
+    import pickle
+    ud.Unit.conversion_priority = "default"
+    units = [ud.Unit(["V"]), ud.Unit(["A"]), ud.Unit(["V"]) ** 100,
+             ud.Unit(["V"])] * 10
+    data = ud.units_to_bytes(units)
+    assert ud.units_from_bytes(data) == units
+    registry = ud.default_registry.copy()
+    registry.define("v", "Velocity", "m/s")
+    f = ud.Unit(["m"], ["s"], registry=registry)
+    g = pickle.loads(pickle.dumps(f))
+    assert repr(g) == "v"
+    assert ud.units_from_bytes(ud.units_to_bytes([f]), registry)[0] is f
+
+
+def test_search_budget():
+    import pickle
+    registry = ud.default_registry.copy()
+    a = ud.Unit(["A"], ["kg", "J"], priority="mechanical", registry=registry)
+    assert repr(a) == "A/(kg*J)"
+    registry.set_search_budget(1000)
+    assert repr(a) == "1/(kg*Wb)"
+    assert repr(ud.Unit(["T", "kg"], ["m", "m", "A"], registry=registry)) \
+        == "kg^2/(m^2*C^2)"
+    assert repr(ud.Unit(["kg", "m", "m"], ["s", "s"], registry=registry)) \
+        == "J"
+    assert repr(ud.Unit(["W"], registry=registry) ** 0.5) == "W^(1/2)"
+    assert pickle.loads(pickle.dumps(registry)).search_budget == 1000
+    # The searched representations are bounded
+    matcher = registry.look_up_table("default").matcher
+    matcher._searched.clear()
+    matcher._searched.resize(2)
+    for exponent in range(1, 5):
+        matcher.search((0, exponent, 0, -1, 0, 0, 0, 0))
+    assert len(matcher._searched._entries) == 2
+    assert matcher._searched.evictions == 2
+    registry.set_search_budget(None)
+    assert repr(a) == "A/(kg*J)"
+    with pytest.raises(ValueError):
+        registry.set_search_budget(0)
+    with pytest.raises(RuntimeError):
+        registry.freeze().set_search_budget(10)
+
+
+def test_search_never_longer():
+    unit_dimensions = ud.default_registry.unit_dimensions
+    for priority in ud.priority_dict:
+        table = ud.look_up_table(priority).table
+        greedy = ud.ConversionMatcher(table)
+        search = ud.ConversionMatcher(table, 1000)
+        for exponents in itertools.product(range(-2, 3), repeat=4):
+            dimension = (0,) + exponents + (0, 0, 0)
+            reduced = search.simplify(dimension)
+            assert len(reduced) <= len(greedy.simplify(dimension))
+            assert tuple(sum(exponent * unit_dimensions[unit][i]
+                             for unit, exponent in reduced)
+                         for i in range(len(dimension))) == dimension
+
+
+def test_dimension_table(tmp_path):
+    registry = ud.default_registry.copy()
+    path = str(tmp_path / "mechanical.bin")
+    table = registry.use_dimension_table("mechanical", path, bound=2)
+    assert table.axes == (1, 2, 3, 4)
+    greedy = ud.ConversionMatcher(registry.look_up_table("mechanical").table)
+    matcher = registry.look_up_table("mechanical").matcher
+    for exponents in itertools.product(range(-3, 4), repeat=4):
+        for rest in ((0, 0, 0), (1, 0, 0)):
+            dimension = (0,) + exponents + rest
+            assert matcher.simplify(dimension) == greedy.simplify(dimension)
+    assert table.look_up((0, 0, 0, 0, 0, 1, 0, 0)) is None
+    loaded = ud.DimensionTable.load(path)
+    assert loaded.fingerprint == table.fingerprint
+    assert repr(ud.Unit(["V"], priority="mechanical", registry=registry)) \
+        == "J/C"
+    # Tables of other conversions are rebuilt
+    registry.define("v", "Velocity", "m/s")
+    matcher = registry.look_up_table("mechanical").matcher
+    with pytest.raises(ValueError):
+        matcher.attach(loaded)
+    table = registry.use_dimension_table("mechanical", path, bound=2)
+    assert table.fingerprint == matcher.fingerprint
+    assert repr(ud.Unit(["m"], ["s"], priority="mechanical",
+                        registry=registry)) == "v"
+    with pytest.raises(ValueError):
+        ud.DimensionTable(b"\0" * 16)
+
+
+def test_slots():
+    unit = ud.Unit(["V"])
+    assert not hasattr(unit, "__dict__")
+    assert not hasattr(ud.V, "__dict__")
+    assert set(ud.default_registry._tables) == set(ud.priority_dict)
+
+
+def test_instrumentation():
+    ud.Unit.conversion_priority = "default"
+    instrumentation = ud.instrumentation
+    greedy = ud.ConversionMatcher._simplify
+    multiply = ud.Unit.__mul__
+    instrumentation.reset()
+    instrumentation.enable()
+    try:
+        ud.simplification_cache.clear()
+        a = ud.Unit(["V"]) * ud.Unit(["A"])
+        b = 1 / ud.Unit(["s"])
+        assert repr(a) == "W"
+        assert repr(b ** 2) == "1/s^2"
+        exported = []
+        counters = instrumentation.export(exported.append)
+        # Units from parsing, decoding and fixed representations
+        ud.Unit.parse("V*A")
+        ud.Unit.from_bytes(a.to_bytes())
+        ud.Unit(["V", "A"], fix_repr=True)
+        constructions = instrumentation.constructions
+    finally:
+        instrumentation.disable()
+    assert exported == [counters]
+    # Three units from the constructor and three from the operators
+    assert counters["constructions"] == 6
+    assert constructions == 9
+    assert counters["operations"] == {"mul": 1, "truediv": 1, "pow": 1}
+    assert counters["conversions"] == {"(m^2*kg)/s^3 -> W": 1}
+    assert counters["histogram"] == {2: 1, 1: 1}
+    assert counters["iterations"] == 3
+    assert counters["searches"] == {"W": 2, "1/s^2": 1}
+    assert ud.ConversionMatcher._simplify is greedy
+    assert ud.Unit.__mul__ is multiply
+    ud.Unit(["V"]) * ud.Unit(["A"])
+    assert instrumentation.export()["constructions"] == 9
+
+
+def test_format():
+    ud.Unit.conversion_priority = "default"
+    a = ud.Unit(["kg", "m", "m"], ["s", "s", "s", "A", "K"])
+    assert a.format() == repr(a) == "V/K"
+    b = ud.Unit(["kg", "m", "m", "m"], ["s", "s", "s", "A", "K"],
+                fix_repr=True)
+    assert b.format("unicode") == "(kg·m³)/(s³·A·K)"
+    assert b.format("latex") == \
+        r"\frac{\mathrm{kg} \cdot \mathrm{m}^{3}}" \
+        r"{\mathrm{s}^{3} \cdot \mathrm{A} \cdot \mathrm{K}}"
+    # Prefixed units with fixed representation keep their prefix
+    d = ud.Unit(["mV"], ["µA", "s"], fix_repr=True)
+    assert repr(d) == "mV/(µA*s)"
+    assert d.format("ascii") == "mV/(uA*s)"
+    assert d.format("unicode") == "mV/(µA·s)"
+    assert d.format("latex") == \
+        r"\frac{\mathrm{mV}}{\mathrm{\mu A} \cdot \mathrm{s}}"
+    import pickle
+    assert pickle.loads(pickle.dumps(d)).format("ascii") == "mV/(uA*s)"
+    c = ud.Unit(["kOhm"]) / ud.Unit(["s"])
+    assert "{:ascii}".format(c) == "kOhm/s"
+    assert ud.Unit.parse(c.format("ascii")) == c
+    assert format(c, "unicode") == "kΩ/s"
+    assert format(ud.Unit(["µA"]), "latex") == r"\mathrm{\mu A}"
+    assert format(1 / ud.Unit(["s", "s"]), "unicode") == "1/s²"
+    assert format(ud.Unit(["W"]) ** 0.5, "unicode") == "W¹ᐟ²"
+    assert format(ud.Unit.parse("10^5*m^2"), "unicode") == "10⁵·m²"
+    assert format(ud.Unit(), "latex") == "1"
+    with pytest.raises(ValueError):
+        c.format("html")
+
+
+def test_quantity_index():
+    ud.Unit.conversion_priority = "default"
+    a = ud.Unit.from_quantity("Magnetic flux")
+    assert a == ud.Unit(["Wb"])
+    assert repr(ud.Unit.from_quantity("Voltage", priority="mechanical")) \
+        == "J/C"
+    assert ud.Unit(["V"], priority="mechanical").quantity == "Voltage"
+    assert ud.Unit(["mV"]).named_units == (ud.V,)
+    assert ud.Unit(["V", "m"]).named_units == ()
+    assert ud.default_registry.named_units(ud.Unit(["N", "m"]).dimension) \
+        == (ud.J,)
+    with pytest.raises(ValueError):
+        ud.Unit.from_quantity("Velocity")
+    registry = ud.default_registry.copy()
+    registry.define("v", "Velocity", "m/s")
+    assert ud.Unit.from_quantity("Velocity", registry=registry) == \
+        ud.Unit(["m"], ["s"], registry=registry)
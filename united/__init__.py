@@ -1,3 +1,5 @@
 """Top-level package for United."""
-from .united import Unit
-
+from .united import Unit, UnitRegistry, default_registry, priority_context
+from .quantity import Quantity, convert
+from .ingest import LabelParser, parse_many
+from .checking import check_units
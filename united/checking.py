@@ -0,0 +1,155 @@
+"""Module for checking the units of function arguments.
+
+Attributes:
+    enabled (bool): Whether decorated functions check units. Defaults to
+                    False when Python runs with ``-O``. Functions decorated
+                    while checking is disabled are returned unchanged.
+"""
+import functools
+import inspect
+
+from .united import Unit
+
+enabled = __debug__
+
+# Number of distinct argument units remembered per function
+_cache_size = 1024
+
+_dimensionless = Unit()
+
+# Marks arguments which were not passed
+_missing = object()
+
+_positional = (inspect.Parameter.POSITIONAL_ONLY,
+               inspect.Parameter.POSITIONAL_OR_KEYWORD)
+
+_variadic = (inspect.Parameter.VAR_POSITIONAL,
+             inspect.Parameter.VAR_KEYWORD)
+
+
+def _expected_unit(spec):
+    """Returns the unit of a unit spec, which can be a unit or a unit
+    expression."""
+    if isinstance(spec, str):
+        return Unit.parse(spec)
+    if not isinstance(spec, Unit):
+        raise TypeError("Unit spec has to be an instance of Unit or str")
+    return spec
+
+
+def _unit_of(value):
+    """Returns the unit of a unit, quantity or quantity array. Plain numbers
+    are dimensionless. Arguments which were not passed have no unit."""
+    if isinstance(value, Unit):
+        return value
+    if value is _missing:
+        return None
+    unit = getattr(value, "unit", None)
+    if isinstance(unit, Unit):
+        return unit
+    return _dimensionless
+
+
+def _check(name, unit, expected):
+    """Raises if a unit has another dimension than the expected unit."""
+    if unit is not None and not unit.is_compatible(expected):
+        raise ValueError("Unit {!r} of '{}' is not compatible with "
+                         "{!r}".format(unit, name, expected))
+
+
+def check_units(returns=None, **units):
+    """Decorator checking the dimensions of the arguments and the return
+    value of a function.
+
+    The arguments can be :class:`.Unit` instances, :class:`.Quantity`
+    instances or any object with a ``unit`` attribute, plain numbers are
+    dimensionless. Units only have to be compatible with the declared
+    units, so ``mV`` is accepted for ``V``. Arguments which are left at
+    their default are not checked. The unit of a ``*args`` or ``**kwargs``
+    parameter is checked for every argument it collects. Every distinct
+    combination of argument units is only validated once.
+
+    Example::
+
+        @check_units(voltage="V", current="A", returns="W")
+        def power(voltage, current):
+            return voltage * current
+
+    Args:
+        returns (Unit, str): Unit of the return value. Defaults to None,
+                             which does not check the return value.
+        **units: Units of the arguments by parameter name as :class:`.Unit`
+                 or unit expression.
+    """
+    expected = {name: _expected_unit(spec) for name, spec in units.items()}
+    expected_return = None if returns is None else _expected_unit(returns)
+
+    def decorator(function):
+        if not enabled:
+            return function
+        parameters = list(inspect.signature(function).parameters.values())
+        names = [parameter.name for parameter in parameters]
+        for name in expected:
+            if name not in names:
+                raise ValueError("'{}' is not a parameter of {}".format(
+                    name, function.__qualname__))
+        # Position in the positional arguments, where *args starts, or None
+        # for keyword only parameters, name, kind and unit of the checked
+        # parameters
+        checked = tuple(
+            (index if parameter.kind in _positional or
+             parameter.kind == inspect.Parameter.VAR_POSITIONAL else None,
+             parameter.name, parameter.kind, expected[parameter.name])
+            for index, parameter in enumerate(parameters)
+            if parameter.name in expected)
+        # Keyword arguments which are not collected by **kwargs
+        keywords = frozenset(parameter.name for parameter in parameters
+                             if parameter.kind not in _variadic)
+
+        def units_of(args, kwargs):
+            """Returns the units of the checked arguments, tuples of units
+            for variadic parameters."""
+            arguments = []
+            for position, name, kind, _ in checked:
+                if kind == inspect.Parameter.VAR_POSITIONAL:
+                    arguments.append(tuple(_unit_of(value)
+                                           for value in args[position:]))
+                elif kind == inspect.Parameter.VAR_KEYWORD:
+                    arguments.append(tuple(
+                        _unit_of(value) for key, value in kwargs.items()
+                        if key not in keywords))
+                else:
+                    arguments.append(_unit_of(
+                        args[position] if position is not None and
+                        position < len(args) else kwargs.get(name, _missing)))
+            return tuple(arguments)
+
+        valid = set()
+        valid_returns = set()
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return function(*args, **kwargs)
+            arguments = units_of(args, kwargs)
+            if arguments not in valid:
+                for units, (_, name, kind, expected_unit) in zip(arguments,
+                                                                 checked):
+                    for unit in units if kind in _variadic else (units,):
+                        _check(name, unit, expected_unit)
+                if len(valid) >= _cache_size:
+                    valid.clear()
+                valid.add(arguments)
+            result = function(*args, **kwargs)
+            if expected_return is not None:
+                unit = _unit_of(result)
+                if unit not in valid_returns:
+                    _check("return value", unit, expected_return)
+                    if len(valid_returns) >= _cache_size:
+                        valid_returns.clear()
+                    valid_returns.add(unit)
+            return result
+
+        return wrapper
+
+    return decorator
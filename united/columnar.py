@@ -0,0 +1,131 @@
+"""Module for dictionary encoded unit columns like in Arrow or Parquet.
+
+Requires NumPy.
+"""
+import json
+
+import numpy as np
+
+from .united import Unit, base_units
+from .unit_array import UnitArray
+
+metadata_key = "united.units"
+
+
+class DictionaryEncodedUnits:
+    """Stores a column of units as a small dictionary of distinct units and
+    an int32 array of codes into the dictionary. Converting from and to
+    :class:`.UnitArray` is vectorized and every distinct unit is only
+    created or parsed once.
+
+    Attributes:
+        codes (numpy.ndarray): int32 array of indexes into the dictionary.
+        dictionary (list): The distinct :class:`.Unit` instances.
+    """
+
+    def __init__(self, codes, dictionary):
+        """Initializes the DictionaryEncodedUnits class.
+
+        Args:
+            codes (array_like): Integer array of indexes into the dictionary.
+            dictionary (list): The distinct :class:`.Unit` instances.
+        """
+        codes = np.asarray(codes, dtype=np.int32)
+        if codes.size and (codes.min() < 0 or codes.max() >= len(dictionary)):
+            raise ValueError("Codes have to be indexes into the dictionary")
+        self.codes = codes
+        self.dictionary = list(dictionary)
+
+    @classmethod
+    def from_units(cls, units):
+        """Encodes a sequence of units.
+
+        Args:
+            units (iterable): :class:`.Unit` instances.
+        """
+        dictionary = []
+        indexes = {}
+        codes = []
+        for unit in units:
+            # Units of different priority or with fixed representation have
+            # different representations although they compare equal
+            fixed = unit._entry is not None and unit._entry[0] is None
+            key = (unit.dimension, unit.scale, unit.registry, unit._priority,
+                   unit.repr if fixed else None)
+            code = indexes.get(key)
+            if code is None:
+                code = indexes[key] = len(dictionary)
+                dictionary.append(unit)
+            codes.append(code)
+        return cls(np.array(codes, dtype=np.int32), dictionary)
+
+    @classmethod
+    def from_unit_array(cls, array):
+        """Encodes a unit array.
+
+        Args:
+            array (UnitArray): The units.
+        """
+        rows = np.concatenate(
+            [array.dimensions.reshape(-1, len(base_units)),
+             array.scales.reshape(-1, 1).astype(array.dimensions.dtype)],
+            axis=1)
+        distinct, inverse = np.unique(rows, axis=0, return_inverse=True)
+        dictionary = [Unit._from_dimension(tuple(int(x) for x in row[:-1]),
+                                           scale=int(row[-1]))
+                      for row in distinct]
+        return cls(inverse.reshape(array.shape), dictionary)
+
+    def to_units(self):
+        """Returns an object array with the unit of every code."""
+        dictionary = np.empty(len(self.dictionary), dtype=object)
+        dictionary[:] = self.dictionary
+        return dictionary[self.codes]
+
+    def to_unit_array(self):
+        """Returns the units as :class:`.UnitArray`."""
+        dimensions = np.array([unit.dimension for unit in self.dictionary],
+                              dtype=np.int64).reshape(-1, len(base_units))
+        scales = np.array([unit.scale for unit in self.dictionary],
+                          dtype=np.int64)
+        return UnitArray(dimensions[self.codes], scales[self.codes])
+
+    def to_metadata(self):
+        """Returns the dictionary as metadata with the representations of
+        the units, which can be stored next to the codes."""
+        return {metadata_key: json.dumps([repr(unit)
+                                          for unit in self.dictionary])}
+
+    @classmethod
+    def from_metadata(cls, codes, metadata, priority=None, registry=None):
+        """Decodes codes with a dictionary stored by :meth:`to_metadata`.
+
+        Args:
+            codes (array_like): Integer array of indexes into the dictionary.
+            metadata (dict): Metadata holding the dictionary. Keys and values
+                             can be str or bytes.
+            priority (str): Conversion priority of the units.
+            registry (UnitRegistry): Registry of the known units.
+        """
+        strings = metadata.get(metadata_key)
+        if strings is None:
+            strings = metadata.get(metadata_key.encode())
+        if strings is None:
+            raise ValueError("Metadata does not hold a unit dictionary")
+        return cls(codes, [Unit.parse(string, priority, registry)
+                           for string in json.loads(strings)])
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __eq__(self, other):
+        if not isinstance(other, DictionaryEncodedUnits):
+            return NotImplemented
+        return self.codes.shape == other.codes.shape and \
+            bool(np.all(self.to_unit_array() == other.to_unit_array()))
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "DictionaryEncodedUnits({}, {})".format(self.codes.tolist(),
+                                                       self.dictionary)
@@ -0,0 +1,123 @@
+"""Module for parsing large streams of unit labels."""
+from collections import OrderedDict
+
+from .united import Unit
+
+
+class LabelParser:
+    """Parses unit labels with deduplication. Every distinct label is parsed
+    once while it stays in a bounded LRU memo and every distinct unit gets an
+    integer code, so streams with few distinct labels are parsed at the cost
+    of a dict lookup per label.
+
+    The codes stay valid for the life of the parser, so the code table is
+    not evicted. It is limited to ``max_units`` distinct units instead,
+    :meth:`reset` starts a new code table, for example per chunk of a
+    stream.
+
+    Attributes:
+        units (list): Maps the integer codes to the shared :class:`.Unit`
+                      instances.
+        labels (int): Number of labels processed.
+        parsed (int): Number of labels which had to be parsed. Equals the
+                      number of distinct labels as long as no label was
+                      evicted from the memo.
+        evictions (int): Number of labels evicted from the memo.
+    """
+
+    def __init__(self, maxsize=65536, max_units=65536):
+        """Initializes the LabelParser class.
+
+        Args:
+            maxsize (int): Maximum number of distinct labels kept in the memo.
+            max_units (int): Maximum number of distinct units in the code
+                             table.
+        """
+        self.maxsize = maxsize
+        self.max_units = max_units
+        self.labels = 0
+        self.parsed = 0
+        self.evictions = 0
+        self.reset()
+
+    def reset(self):
+        """Removes all codes and memoized labels. Codes returned before refer
+        to the previous :attr:`units` list, which is not modified."""
+        self.units = []
+        self._codes = {}
+        self._memo = OrderedDict()
+
+    def code(self, label):
+        """Returns the integer code of the unit of a label.
+
+        Args:
+            label (str): Unit expression like ``"kg*m^2/(s^3*A)"``.
+        """
+        self.labels += 1
+        code = self._memo.get(label)
+        if code is not None:
+            self._memo.move_to_end(label)
+            return code
+        unit = Unit.parse(label)
+        self.parsed += 1
+        code = self._codes.get(unit)
+        if code is None:
+            code = len(self.units)
+            if code >= self.max_units:
+                raise RuntimeError("More than {} distinct units, reset the "
+                                   "parser".format(self.max_units))
+            self._codes[unit] = code
+            self.units.append(unit)
+        self._memo[label] = code
+        if len(self._memo) > self.maxsize:
+            self._memo.popitem(last=False)
+            self.evictions += 1
+        return code
+
+    def parse(self, label):
+        """Returns the shared unit of a label.
+
+        Args:
+            label (str): Unit expression like ``"kg*m^2/(s^3*A)"``.
+        """
+        return self.units[self.code(label)]
+
+    def parse_many(self, labels):
+        """Yields the shared unit of every label.
+
+        Args:
+            labels (iterable): Unit expressions.
+        """
+        for label in labels:
+            yield self.units[self.code(label)]
+
+    def encode(self, labels):
+        """Yields the integer code of every label. The codes refer to
+        :attr:`units`.
+
+        Args:
+            labels (iterable): Unit expressions.
+        """
+        for label in labels:
+            yield self.code(label)
+
+    def info(self):
+        """Returns the counters of the parser as a dict."""
+        return {"labels": self.labels, "parsed": self.parsed,
+                "distinct_units": len(self.units),
+                "evictions": self.evictions}
+
+
+def parse_many(labels, parser=None):
+    """Yields the shared unit of every label of an iterable.
+
+    Every distinct label is only parsed once. Pass a :class:`.LabelParser`
+    to read the statistics afterwards or to share the memo between calls.
+
+    Args:
+        labels (iterable): Unit expressions like ``"kg*m^2/(s^3*A)"``.
+        parser (LabelParser): Parser to use. A new one is created by default.
+    """
+    if parser is None:
+        parser = LabelParser()
+    return parser.parse_many(labels)
@@ -0,0 +1,154 @@
+"""Module for quantities which pair a numeric value with a unit."""
+from numbers import Number
+
+from .united import Unit
+
+
+class Quantity:
+    """Represents a physical quantity by storing a numeric value together
+    with a :class:`.Unit`. The value can be a scalar or an array like a NumPy
+    array. Arithmetic operations are applied to the values and the units
+    separately, so the units are only checked and propagated once per
+    operation regardless of the size of the value.
+    """
+
+    # Make NumPy defer to the reflected operators of this class
+    __array_ufunc__ = None
+
+    def __init__(self, value, unit=None):
+        """Initializes the Quantity class.
+
+        Args:
+            value: Scalar or array holding the numeric value. Arrays are
+                   stored without copying.
+            unit (Unit): Unit of the value. Defaults to a dimensionless
+                         unit.
+        """
+        if unit is None:
+            unit = Unit()
+        if not isinstance(unit, Unit):
+            raise TypeError("Unit has to be an instance of Unit")
+        self.value = value
+        self.unit = unit
+
+    def _check_unit(self, other):
+        """Returns the value of the other quantity if the units match."""
+        if not isinstance(other, Quantity):
+            raise TypeError("Unsupported operand {!r} for quantity".format(
+                other))
+        if self.unit != other.unit:
+            raise ValueError("Cannot add unequal units")
+        return other.value
+
+    def __add__(self, other):
+        return Quantity(self.value + self._check_unit(other), self.unit)
+
+    def __sub__(self, other):
+        return Quantity(self.value - self._check_unit(other), self.unit)
+
+    def __iadd__(self, other):
+        self.value += self._check_unit(other)
+        return self
+
+    def __isub__(self, other):
+        self.value -= self._check_unit(other)
+        return self
+
+    def __mul__(self, other):
+        if isinstance(other, Quantity):
+            return Quantity(self.value * other.value, self.unit * other.unit)
+        if isinstance(other, Unit):
+            return Quantity(self.value, self.unit * other)
+        return Quantity(self.value * other, self.unit)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, Quantity):
+            return Quantity(self.value / other.value, self.unit / other.unit)
+        if isinstance(other, Unit):
+            return Quantity(self.value, self.unit / other)
+        return Quantity(self.value / other, self.unit)
+
+    def __rtruediv__(self, other):
+        if isinstance(other, Unit):
+            return Quantity(1 / self.value, other / self.unit)
+        return Quantity(other / self.value, 1 / self.unit)
+
+    def __pow__(self, power, modulo=None):
+        if not isinstance(power, Number):
+            raise TypeError("Power has to be a number")
+        unit = self.unit ** power
+        if not isinstance(unit, Unit):
+            unit = Unit()
+        return Quantity(self.value ** power, unit)
+
+    def to(self, unit, out=None):
+        """Returns the quantity converted into another unit.
+
+        Args:
+            unit (Unit): Unit with the same dimension to convert to.
+            out (numpy.ndarray): Array the converted values are written to.
+                                 Can be the value of the quantity itself.
+        """
+        return Quantity(convert(self.value, self.unit, unit, out), unit)
+
+    def __neg__(self):
+        return Quantity(-self.value, self.unit)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return Quantity(abs(self.value), self.unit)
+
+    def __eq__(self, other):
+        if not isinstance(other, Quantity):
+            return NotImplemented
+        if self.unit != other.unit:
+            return False
+        return self.value == other.value
+
+    def __lt__(self, other):
+        return self.value < self._check_unit(other)
+
+    def __le__(self, other):
+        return self.value <= self._check_unit(other)
+
+    def __gt__(self, other):
+        return self.value > self._check_unit(other)
+
+    def __ge__(self, other):
+        return self.value >= self._check_unit(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "{} {!r}".format(self.value, self.unit)
+
+
+def convert(values, unit, target, out=None):
+    """Converts values from one unit into another unit with the same
+    dimension.
+
+    The conversion factor is computed once from the units and applied in a
+    single multiplication. Sequences other than scalars are converted with
+    NumPy and returned as arrays. Scalars and arrays are returned unchanged
+    when no scaling is needed and no output array is given.
+
+    Args:
+        values: Scalar, sequence or array with values of the unit.
+        unit (Unit): Unit of the values.
+        target (Unit): Unit to convert to.
+        out (numpy.ndarray): Array the converted values are written to. Can
+                             be ``values`` itself to convert in place.
+    """
+    factor = unit.conversion_factor(target)
+    if out is None and isinstance(values, Number):
+        if factor == 1:
+            return values
+        return values * factor
+    import numpy as np
+    if out is None and factor == 1:
+        return np.asarray(values)
+    return np.multiply(values, factor, out=out)
@@ -0,0 +1,172 @@
+"""Module for arrays of units backed by a NumPy exponent matrix.
+
+Requires NumPy.
+"""
+import numpy as np
+
+from .united import Unit, base_units
+
+
+class UnitArray:
+    """Stores many units as an integer matrix of dimension vectors with one
+    row per unit and an integer array with the power of ten of every unit.
+    Supports elementwise multiplying, dividing, raising power and comparing
+    with other :class:`.UnitArray` and :class:`.Unit` instances following
+    the NumPy broadcasting rules. Representations are resolved once per
+    distinct unit.
+    """
+
+    def __init__(self, dimensions, scales=None):
+        """Initializes the UnitArray class.
+
+        Args:
+            dimensions (array_like): Integer array of shape (..., 8) holding
+                                     the exponents of the SI base units.
+            scales (array_like): Integer array with the power of ten of every
+                                 unit. Defaults to zeros.
+        """
+        dimensions = np.asarray(dimensions)
+        if dimensions.ndim < 1 or dimensions.shape[-1] != len(base_units):
+            raise ValueError("Dimensions have to be of shape (..., {})".format(
+                len(base_units)))
+        if not np.issubdtype(dimensions.dtype, np.integer):
+            raise ValueError("Dimensions have to be integers")
+        if scales is None:
+            scales = np.zeros(dimensions.shape[:-1], dtype=dimensions.dtype)
+        scales = np.asarray(scales)
+        if not np.issubdtype(scales.dtype, np.integer):
+            raise ValueError("Scales have to be integers")
+        self.dimensions = dimensions
+        self.scales = np.broadcast_to(scales, dimensions.shape[:-1])
+
+    @classmethod
+    def from_units(cls, units):
+        """Creates a unit array from a sequence of units.
+
+        Args:
+            units (iterable): :class:`.Unit` instances.
+        """
+        units = list(units)
+        return cls(np.array([unit.dimension for unit in units],
+                            dtype=np.int64).reshape(-1, len(base_units)),
+                   np.array([unit.scale for unit in units], dtype=np.int64))
+
+    @property
+    def shape(self):
+        """tuple: Shape of the array without the dimension axis."""
+        return self.dimensions.shape[:-1]
+
+    def __len__(self):
+        return self.dimensions.shape[0]
+
+    def __getitem__(self, item):
+        dimensions = self.dimensions[item]
+        scales = self.scales[item]
+        if dimensions.ndim == 1:
+            return Unit._from_dimension(tuple(int(x) for x in dimensions),
+                                        scale=int(scales))
+        return UnitArray(dimensions, scales)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def _other(self, other):
+        """Returns the dimensions and scales of the other operand."""
+        if isinstance(other, UnitArray):
+            return other.dimensions, other.scales
+        if isinstance(other, Unit):
+            if any(type(x) is not int for x in other.dimension) or \
+                    type(other.scale) is not int:
+                raise ValueError("Unit arrays only support whole exponents")
+            return np.array(other.dimension, dtype=self.dimensions.dtype), \
+                other.scale
+        return None
+
+    def __mul__(self, other):
+        if isinstance(other, int) and not isinstance(other, bool):
+            if other == 1:
+                return self
+            raise TypeError("Unsupported operand for integer other than 1")
+        other = self._other(other)
+        if other is None:
+            return NotImplemented
+        dimensions, scales = other
+        return UnitArray(self.dimensions + dimensions, self.scales + scales)
+
+    __rmul__ = __mul__
+
+    def __floordiv__(self, other):
+        if isinstance(other, int) and not isinstance(other, bool):
+            if other == 1:
+                return self
+            raise TypeError("Unsupported operand for integer other than 1")
+        other = self._other(other)
+        if other is None:
+            return NotImplemented
+        dimensions, scales = other
+        return UnitArray(self.dimensions - dimensions, self.scales - scales)
+
+    def __rfloordiv__(self, other):
+        if isinstance(other, int) and not isinstance(other, bool):
+            if other == 1:
+                return UnitArray(-self.dimensions, -self.scales)
+            raise TypeError("Unsupported operand for integer other than 1")
+        other = self._other(other)
+        if other is None:
+            return NotImplemented
+        dimensions, scales = other
+        return UnitArray(dimensions - self.dimensions, scales - self.scales)
+
+    __truediv__ = __floordiv__
+    __rtruediv__ = __rfloordiv__
+
+    def __pow__(self, power, modulo=None):
+        power = np.asarray(power)
+        if not np.issubdtype(power.dtype, np.integer):
+            raise TypeError("Power has to be an integer")
+        return UnitArray(self.dimensions * power[..., np.newaxis],
+                         self.scales * power)
+
+    def __eq__(self, other):
+        other = self._other(other)
+        if other is None:
+            return NotImplemented
+        dimensions, scales = other
+        return np.all(self.dimensions == dimensions, axis=-1) & \
+            (self.scales == scales)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return ~equal
+
+    __hash__ = None
+
+    def _resolve(self, attribute):
+        """Resolves an attribute once per distinct unit and scatters the
+        results into an object array of the shape of the unit array."""
+        rows = np.concatenate(
+            [self.dimensions.reshape(-1, len(base_units)),
+             self.scales.reshape(-1, 1).astype(self.dimensions.dtype)],
+            axis=1)
+        distinct, inverse = np.unique(rows, axis=0, return_inverse=True)
+        values = np.empty(len(distinct), dtype=object)
+        for index, row in enumerate(distinct):
+            values[index] = getattr(
+                Unit._from_dimension(tuple(int(x) for x in row[:-1]),
+                                     scale=int(row[-1])), attribute)
+        return values[inverse.reshape(-1)].reshape(self.shape)
+
+    def reprs(self):
+        """Returns an object array with the representation of every unit."""
+        return self._resolve("repr")
+
+    def quantities(self):
+        """Returns an object array with the quantity of every unit. Units
+        which are not a known SI unit have the quantity None."""
+        return self._resolve("quantity")
+
+    def __repr__(self):
+        return "UnitArray({})".format(self.reprs().tolist())
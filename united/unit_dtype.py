@@ -0,0 +1,402 @@
+"""Module for pandas columns of values with a shared unit.
+
+Requires pandas.
+"""
+import numbers
+import re
+
+import numpy as np
+import pandas
+from pandas.api.extensions import (ExtensionArray, ExtensionDtype,
+                                   register_extension_dtype, take)
+from pandas.api.indexers import check_array_indexer
+from pandas.api.types import is_list_like
+
+from .quantity import Quantity
+from .united import Unit
+
+
+@register_extension_dtype
+class UnitDtype(ExtensionDtype):
+    """pandas dtype of a column whose values share one :class:`.Unit`.
+
+    The dtype is named like ``"unit[V]"``, so columns can be converted with
+    ``astype("unit[mV]")``. Concatenating columns with different units of
+    the same dimension converts them to the unit of the first column.
+    Columns of different dimensions are combined as objects, for example
+    in the rows of a DataFrame.
+
+    Attributes:
+        unit (Unit): Unit of the values.
+    """
+
+    type = Quantity
+    kind = "O"
+    na_value = np.nan
+    _metadata = ("unit",)
+    _match = re.compile(r"^unit\[(?P<unit>.*)\]$")
+
+    def __init__(self, unit=None):
+        """Initializes the UnitDtype class.
+
+        Args:
+            unit (Unit, str): Unit of the values or a unit expression.
+                              Defaults to a dimensionless unit.
+        """
+        if unit is None:
+            unit = Unit()
+        elif isinstance(unit, str):
+            unit = Unit.parse(unit)
+        elif not isinstance(unit, Unit):
+            raise TypeError("Unit has to be an instance of Unit or str")
+        self.unit = unit
+
+    @property
+    def name(self):
+        """str: Name of the dtype."""
+        return "unit[{}]".format(self.unit)
+
+    @classmethod
+    def construct_from_string(cls, string):
+        if not isinstance(string, str):
+            raise TypeError("'construct_from_string' expects a string, got "
+                            "{}".format(type(string)))
+        match = cls._match.match(string)
+        if match is None:
+            raise TypeError("Cannot construct a 'UnitDtype' from "
+                            "'{}'".format(string))
+        return cls(match.group("unit"))
+
+    @classmethod
+    def construct_array_type(cls):
+        return QuantityArray
+
+    def _get_common_dtype(self, dtypes):
+        # Columns of different dimensions are combined as objects
+        if all(isinstance(dtype, UnitDtype) and
+               self.unit.is_compatible(dtype.unit) for dtype in dtypes):
+            return self
+        return np.dtype(object)
+
+
+class QuantityArray(ExtensionArray):
+    """pandas extension array of numeric values with one shared
+    :class:`.Unit`.
+
+    The values are stored in a NumPy array and the unit once for the whole
+    array. Arithmetic operations are applied to the values and the units
+    separately, so units are only checked and propagated once per
+    operation. Single elements are returned as :class:`.Quantity`.
+    """
+
+    def __init__(self, values, unit=None, copy=False):
+        """Initializes the QuantityArray class.
+
+        Args:
+            values (array_like): One-dimensional numeric values.
+            unit (Unit): Unit of the values. Defaults to a dimensionless
+                         unit.
+            copy (bool): Whether to copy the values.
+        """
+        values = np.array(values, copy=copy or None)
+        if values.ndim != 1:
+            raise ValueError("Values have to be one-dimensional")
+        if not np.issubdtype(values.dtype, np.number):
+            values = values.astype(np.float64)
+        self._value = values
+        self._dtype = UnitDtype(unit)
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    @property
+    def unit(self):
+        """Unit: Unit of the values."""
+        return self._dtype.unit
+
+    @property
+    def value(self):
+        """numpy.ndarray: The values in the unit of the array."""
+        return self._value
+
+    @classmethod
+    def _from_sequence(cls, scalars, *, dtype=None, copy=False):
+        if isinstance(dtype, str):
+            dtype = UnitDtype.construct_from_string(dtype)
+        if isinstance(scalars, QuantityArray):
+            if dtype is None:
+                return scalars.copy() if copy else scalars
+            return scalars.astype(dtype, copy=copy)
+        unit = None if dtype is None else dtype.unit
+        if unit is None:
+            scalars = list(scalars)
+            unit = next((scalar.unit for scalar in scalars
+                         if isinstance(scalar, Quantity)), Unit())
+        values = np.asarray([
+            scalar.to(unit).value if isinstance(scalar, Quantity) else
+            np.nan if scalar is None else scalar for scalar in scalars])
+        if values.dtype == object:
+            values = values.astype(np.float64)
+        return cls(values, unit)
+
+    @classmethod
+    def _from_factorized(cls, values, original):
+        return cls(values, original.unit)
+
+    def _values_for_factorize(self):
+        return self._value, np.nan
+
+    def _values_for_argsort(self):
+        return self._value
+
+    def unique(self):
+        return QuantityArray(pandas.unique(self._value), self.unit)
+
+    def value_counts(self, dropna=True):
+        """Returns the number of occurrences of every value as a Series.
+
+        Args:
+            dropna (bool): Whether to leave out missing values.
+        """
+        counts = pandas.Series(self._value).value_counts(dropna=dropna)
+        return pandas.Series(counts.to_numpy(), index=pandas.Index(
+            QuantityArray(counts.index.to_numpy(), self.unit)), name="count")
+
+    def searchsorted(self, value, side="left", sorter=None):
+        return np.searchsorted(self._value, self._magnitude(value), side,
+                               sorter)
+
+    def __getitem__(self, item):
+        if isinstance(item, numbers.Integral):
+            value = self._value[item]
+            if value != value:
+                return self.dtype.na_value
+            return Quantity(value, self.unit)
+        item = check_array_indexer(self, item) \
+            if is_list_like(item) else item
+        return QuantityArray(self._value[item], self.unit)
+
+    def __setitem__(self, key, value):
+        if is_list_like(key):
+            key = check_array_indexer(self, key)
+        self._value[key] = self._magnitude(value)
+
+    def _magnitude(self, value):
+        """Returns values of a quantity or array in the unit of the array.
+        Plain numbers are taken as values of the unit."""
+        if isinstance(value, (QuantityArray, Quantity)):
+            return value.to(self.unit).value if isinstance(value, Quantity) \
+                else value.astype(self.dtype)._value
+        if is_list_like(value):
+            return self._from_sequence(value, dtype=self.dtype)._value
+        return np.nan if value is None else value
+
+    def to(self, unit):
+        """Returns the values converted into another unit with the same
+        dimension.
+
+        Args:
+            unit (Unit): Unit to convert to.
+        """
+        return QuantityArray(self._value * self.unit.conversion_factor(unit),
+                             unit)
+
+    def __len__(self):
+        return len(self._value)
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None or np.dtype(dtype) == object:
+            array = np.empty(len(self), dtype=object)
+            array[:] = [self[index] for index in range(len(self))]
+            return array
+        # Values in the unit of the array for numeric dtypes
+        return np.array(self._value, dtype=dtype, copy=copy)
+
+    @property
+    def nbytes(self):
+        return self._value.nbytes
+
+    def isna(self):
+        if np.issubdtype(self._value.dtype, np.floating):
+            return np.isnan(self._value)
+        return np.zeros(len(self), dtype=bool)
+
+    def take(self, indices, *, allow_fill=False, fill_value=None):
+        if allow_fill:
+            fill_value = np.nan if fill_value is None \
+                else self._magnitude(fill_value)
+        values = self._value
+        if allow_fill and not np.issubdtype(values.dtype, np.floating):
+            values = values.astype(np.float64)
+        return QuantityArray(take(values, indices, allow_fill=allow_fill,
+                                  fill_value=fill_value), self.unit)
+
+    def copy(self):
+        return QuantityArray(self._value, self.unit, copy=True)
+
+    @classmethod
+    def _concat_same_type(cls, to_concat):
+        unit = to_concat[0].unit
+        for array in to_concat:
+            if not unit.is_compatible(array.unit):
+                raise ValueError("Cannot concatenate the units {!r} and "
+                                 "{!r}".format(unit, array.unit))
+        return cls(np.concatenate([array._value if array.unit == unit
+                                   else array.to(unit)._value
+                                   for array in to_concat]), unit)
+
+    def astype(self, dtype, copy=True):
+        if isinstance(dtype, str) and dtype.startswith("unit["):
+            dtype = UnitDtype.construct_from_string(dtype)
+        if isinstance(dtype, UnitDtype):
+            if dtype.unit == self.unit:
+                return self.copy() if copy else self
+            return self.to(dtype.unit)
+        if isinstance(dtype, ExtensionDtype):
+            return super().astype(dtype, copy)
+        if np.dtype(dtype) == object:
+            return self.__array__(object)
+        return np.array(self._value, dtype=dtype, copy=copy or None)
+
+    def _reduce(self, name, *, skipna=True, keepdims=False, **kwargs):
+        functions = {"sum": np.nansum, "mean": np.nanmean,
+                     "median": np.nanmedian, "min": np.nanmin,
+                     "max": np.nanmax, "std": np.nanstd, "var": np.nanvar}
+        if name not in functions:
+            raise TypeError("Cannot perform reduction '{}' with "
+                            "QuantityArray".format(name))
+        if name in ("std", "var"):
+            kwargs = {"ddof": kwargs.get("ddof", 1)}
+        else:
+            kwargs = {}
+        function = functions[name] if skipna else getattr(np, name)
+        value = function(self._value, **kwargs)
+        unit = self.unit ** 2 if name == "var" else self.unit
+        if keepdims:
+            return QuantityArray([value], unit)
+        return Quantity(value, unit)
+
+    def _other(self, other):
+        """Returns the values and the unit of the other operand or None if
+        the operand is not supported."""
+        if isinstance(other, (QuantityArray, Quantity)):
+            return np.asarray(other.value), other.unit
+        if isinstance(other, (numbers.Number, np.ndarray, list)):
+            return np.asarray(other), None
+        return None
+
+    def _check_unit(self, other):
+        """Returns the values of the other operand if the units match."""
+        other = self._other(other)
+        if other is None:
+            return None
+        values, unit = other
+        if unit is None:
+            raise TypeError("Only quantities can be added to quantities")
+        if self.unit != unit:
+            raise ValueError("Cannot add unequal units")
+        return values
+
+    def __add__(self, other):
+        values = self._check_unit(other)
+        if values is None:
+            return NotImplemented
+        return QuantityArray(self._value + values, self.unit)
+
+    def __sub__(self, other):
+        values = self._check_unit(other)
+        if values is None:
+            return NotImplemented
+        return QuantityArray(self._value - values, self.unit)
+
+    def __radd__(self, other):
+        values = self._check_unit(other)
+        if values is None:
+            return NotImplemented
+        return QuantityArray(values + self._value, self.unit)
+
+    def __rsub__(self, other):
+        values = self._check_unit(other)
+        if values is None:
+            return NotImplemented
+        return QuantityArray(values - self._value, self.unit)
+
+    def __mul__(self, other):
+        if isinstance(other, Unit):
+            return QuantityArray(self._value, self.unit * other)
+        other = self._other(other)
+        if other is None:
+            return NotImplemented
+        values, unit = other
+        return QuantityArray(self._value * values, self.unit
+                             if unit is None else self.unit * unit)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, Unit):
+            return QuantityArray(self._value, self.unit / other)
+        other = self._other(other)
+        if other is None:
+            return NotImplemented
+        values, unit = other
+        return QuantityArray(self._value / values, self.unit
+                             if unit is None else self.unit / unit)
+
+    def __rtruediv__(self, other):
+        if isinstance(other, Unit):
+            return QuantityArray(1 / self._value, other / self.unit)
+        other = self._other(other)
+        if other is None:
+            return NotImplemented
+        values, unit = other
+        return QuantityArray(values / self._value, 1 / self.unit
+                             if unit is None else unit / self.unit)
+
+    def __pow__(self, power, modulo=None):
+        if not isinstance(power, numbers.Number):
+            raise TypeError("Power has to be a number")
+        unit = self.unit ** power
+        if not isinstance(unit, Unit):
+            unit = Unit()
+        return QuantityArray(self._value ** power, unit)
+
+    def __neg__(self):
+        return QuantityArray(-self._value, self.unit)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return QuantityArray(np.abs(self._value), self.unit)
+
+    def _compare(self, other, operator):
+        values = self._check_unit(other)
+        if values is None:
+            return NotImplemented
+        return operator(self._value, values)
+
+    def __eq__(self, other):
+        if isinstance(other, (QuantityArray, Quantity)) and \
+                self.unit != other.unit:
+            return np.zeros(len(self), dtype=bool)
+        return self._compare(other, np.equal)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return ~equal
+
+    def __lt__(self, other):
+        return self._compare(other, np.less)
+
+    def __le__(self, other):
+        return self._compare(other, np.less_equal)
+
+    def __gt__(self, other):
+        return self._compare(other, np.greater)
+
+    def __ge__(self, other):
+        return self._compare(other, np.greater_equal)
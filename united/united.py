@@ -1,16 +1,42 @@
-import copy
-from dataclasses import dataclass
-from collections import Counter
+import hashlib
+import heapq
+import itertools
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+import weakref
+from fractions import Fraction
+from functools import lru_cache
+from math import floor, gcd
+from dataclasses import dataclass, field
+from collections import Counter, OrderedDict
 
 """Module for converting SI units automatically.
 
 Attributes:
     si_base_units (dict): Convert SI base unit string into the corresponding
-                          :class:`.NamedUnit`.
+                          :class:`.NamedUnit`. The order of this dict defines
+                          the order of the entries of a dimension vector.
+    base_units (tuple): The :class:`.NamedUnit` instances of the SI base
+                        units in the order of a dimension vector.
     conversion_list: Holds all possible :class:`.Conversions` for SI units.
     si_base_conversions (list): Extracted list from conversions_list which
                                 only holds conversion from SI base units to
                                 SI units.
+    default_registry (UnitRegistry): Registry of the SI units built from
+                                     ``si_units``, ``conversion_list`` and
+                                     ``priority_dict``.
+    symbol_dimensions (dict): Maps the symbols which can be given to
+                              :class:`.Unit` to their dimension vector in
+                              the default registry.
+    symbol_aliases (dict): Maps alternative spellings accepted by the parser
+                           to unit symbols.
+    si_prefixes (dict): Maps SI prefixes to their power of ten.
     default_priority (list): Contains the indexes for how the conversion_list
                              should be sorted in default.
     electrical_priority (list): Contains the indexes for how the 
@@ -20,6 +46,11 @@ Attributes:
                                 conversion_list should be sorted to prioritize 
                                 mechanical units.
     priority_dict: Maps strings to the according priority list.                   
+    simplification_cache (SimplificationCache): Caches the representation
+                                                of already resolved
+                                                dimensions.
+    instrumentation (Instrumentation): Opt-in counters of the unit
+                                      operations and the conversion search.
 """
 
 
@@ -27,6 +58,8 @@ class NamedUnit:
     """Class storing known SI units with their unit symbol and the quantity
     name.
     """
+    __slots__ = ("unit", "quantity")
+
     def __init__(self, unit, quantity):
         self.unit = unit
         self.quantity = quantity
@@ -34,6 +67,19 @@ class NamedUnit:
     def __repr__(self):
         return self.unit
 
+    def __reduce__(self):
+        # Units of the default registry are restored as the same instance
+        for name, unit in default_registry.units.items():
+            if unit is self:
+                return _default_named_unit, (name,)
+        return NamedUnit, (self.unit, self.quantity)
+
+
+def _default_named_unit(name):
+    """Returns the named unit of the default registry with the given
+    name."""
+    return default_registry.units[name]
+
 
 rad = NamedUnit("rad", "Radiant")
 s = NamedUnit("s", "Time")
@@ -57,14 +103,23 @@ T = NamedUnit("T", "Magnetic Induction")
 Pa = NamedUnit("Pa", "Pressure")
 Hz = NamedUnit("Hz", "Frequency")
 
-si_base_units = {"s": s, "kg": kg, "A": A, "m": m, "K": K, "mol": mol,
-                 "cd": cd, "rad": rad}
+si_base_units = {"rad": rad, "m": m, "kg": kg, "s": s, "A": A, "K": K,
+                 "mol": mol, "cd": cd}
 
 si_units = {"rad": rad, "Ohm": Ohm, "V": V, "F": F, "S": S, "W": W, "C": C,
             "H": H, "Wb": Wb, "J": J, "N": N, "T": T, "Pa": Pa, "Hz": Hz}
 
 si_units.update(si_base_units)
 
+si_prefixes = {"Y": 24, "Z": 21, "E": 18, "P": 15, "T": 12, "G": 9, "M": 6,
+               "k": 3, "h": 2, "da": 1, "d": -1, "c": -2, "m": -3, "µ": -6,
+               "μ": -6, "u": -6, "n": -9, "p": -12, "f": -15, "a": -18,
+               "z": -21, "y": -24}
+
+# Prefix used in representations for every power of ten
+_prefix_symbols = {scale: prefix for prefix, scale in si_prefixes.items()
+                   if prefix not in ("μ", "u")}
+
 
 @dataclass
 class Conversion:
@@ -74,6 +129,13 @@ class Conversion:
     result: NamedUnit
     reciprocal: bool = True
     match_exactly: bool = False
+    exponents: dict = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Exponent of every unit of the conversion, negative for denominators
+        self.exponents = dict(Counter(self.numerators))
+        for unit in self.denominators:
+            self.exponents[unit] = self.exponents.get(unit, 0) - 1
 
 
 conversion_list = [Conversion((m, m, kg), (s, s, s, A), V),
@@ -110,173 +172,1446 @@ priority_dict = {"default": default_priority,
                  "electrical": electrical_priority,
                  "mechanical": mechanical_priority}
 
+base_units = tuple(si_base_units.values())
+
+_base_index = {unit: index for index, unit in enumerate(base_units)}
+
+
+def dimension_of(numerators, denominators):
+    """Returns the dimension vector of a fraction of SI base units.
+
+    Args:
+        numerators (tuple, list): SI base units of the numerator.
+        denominators (tuple, list): SI base units of the denominator.
+    """
+    dimension = [0] * len(base_units)
+    for unit in numerators:
+        dimension[_base_index[unit]] += 1
+    for unit in denominators:
+        dimension[_base_index[unit]] -= 1
+    return tuple(dimension)
+
+
+# Symbols accepted by the parser in addition to the symbols of the units
+symbol_aliases = {"Ohm": "Ω"}
+
+
+class ConversionMatcher:
+    """Greedy conversion search compiled from a prioritized look up table.
+
+    Every :class:`.Conversion` is turned into an exponent vector over the SI
+    base units and all named units occurring in the table. Bit masks of the
+    units with positive and negative exponents sort out most conversions
+    before their exponents are compared.
+
+    With a search budget the matcher looks for the representation with the
+    fewest units instead, see :meth:`search`.
+    """
+
+    def __init__(self, table, budget=None):
+        """Initializes the ConversionMatcher class.
+
+        Args:
+            table (list): Prioritized list of :class:`.Conversion`.
+            budget (int): Maximum number of representations examined by the
+                          search for the shortest representation. Defaults
+                          to None for the greedy conversion search.
+        """
+        self.budget = budget
+        self.table = tuple(table)
+        self._searched = SimplificationCache()
+        self._precomputed = None
+        symbols = list(base_units)
+        for conversion in table:
+            for unit in list(conversion.exponents) + [conversion.result]:
+                if unit not in symbols:
+                    symbols.append(unit)
+        self.symbols = tuple(symbols)
+        index = self._index = {unit: i for i, unit in enumerate(symbols)}
+        self.rules = []
+        for conversion in table:
+            vector = [0] * len(symbols)
+            for unit, exponent in conversion.exponents.items():
+                vector[index[unit]] = exponent
+            self.rules.append((
+                _mask(vector, 1), _mask(vector, -1),
+                tuple((i, x) for i, x in enumerate(vector) if x),
+                vector, index[conversion.result],
+                conversion.reciprocal, conversion.match_exactly))
+
+    def simplify(self, dimension):
+        """Applies the conversions to a dimension vector.
+
+        The first conversion in the look up table which divides the current
+        representation is applied and the search starts over until no
+        conversion is applicable anymore. Dimensions with fractional
+        exponents are scaled to whole exponents for the search and scaled
+        back afterwards, either as a whole or split into their whole part and
+        the fractional remainder, whichever needs fewer units. Among splits
+        with as many units, fractional exponents in the denominator are
+        preferred. Matchers with a budget use :meth:`search` instead of the
+        greedy search.
+
+        Args:
+            dimension (tuple): Dimension vector over the SI base units.
+
+        Returns:
+            tuple: Pairs of :class:`.NamedUnit` and exponent in the order of
+                   the representation. Negative exponents are denominators.
+        """
+        simplify = self._simplify if self.budget is None else self.search
+        if all(type(x) is int for x in dimension):
+            if self._precomputed is not None:
+                reduced = self._precomputed.look_up(dimension)
+                if reduced is not None:
+                    return reduced
+            return simplify(dimension)
+        scale = 1
+        for x in dimension:
+            denominator = Fraction(x).denominator
+            scale = scale * denominator // gcd(scale, denominator)
+        # Simplify the whole dimension scaled to whole exponents
+        scaled = tuple((unit, Fraction(exponent, scale)) for unit, exponent
+                       in simplify(tuple(int(x * scale) for x in dimension)))
+        candidates = [scaled]
+        # Simplify whole part and fractional remainder separately, with the
+        # whole part truncated toward zero or rounded down. The remainder of
+        # the rounded down part is simplified as reciprocal, so s^(1/2)
+        # becomes 1/Hz^(1/2) like the denominator of V/Hz^(1/2)
+        for whole, sign in ((tuple(int(x) for x in dimension), 1),
+                            (tuple(floor(x) for x in dimension), -1)):
+            split = dict(simplify(whole))
+            for unit, exponent in simplify(tuple(
+                    sign * int((x - y) * scale)
+                    for x, y in zip(dimension, whole))):
+                exponent = split.get(unit, 0) + Fraction(sign * exponent,
+                                                         scale)
+                if exponent:
+                    split[unit] = exponent
+                else:
+                    del split[unit]
+            candidates.append(tuple(split.items()))
+        # Prefer fewer units, then fewer fractional exponents, then the
+        # whole dimension and then fractional exponents in the denominator
+        reduced = min(candidates, key=lambda x: (
+            len(x), sum(Fraction(e).denominator != 1 for _, e in x),
+            x is not scaled,
+            sum(Fraction(e).denominator != 1 and e > 0 for _, e in x)))
+        return tuple((unit, _normalize_exponent(exponent))
+                     for unit, exponent in reduced)
+
+    @property
+    def fingerprint(self):
+        """str: Hash of the conversions and the search budget, which
+        identifies the representations found by the matcher."""
+        rules = [(rule[3], rule[4], rule[5], rule[6]) for rule in self.rules]
+        return hashlib.sha1(repr((
+            [repr(unit) for unit in self.symbols], rules,
+            self.budget)).encode()).hexdigest()
+
+    @property
+    def axes(self):
+        """tuple: Indexes of the SI base units which occur in a
+        conversion."""
+        return tuple(i for i in range(len(base_units))
+                     if any(rule[3][i] for rule in self.rules))
+
+    def attach(self, table):
+        """Uses a precomputed :class:`.DimensionTable` for the dimensions it
+        covers.
+
+        Args:
+            table (DimensionTable): Table built with an equal matcher.
+        """
+        if table.fingerprint != self.fingerprint:
+            raise ValueError("The dimension table was built for other "
+                             "conversions")
+        # Bind a view of the table to the named units of this matcher
+        units = {repr(unit): unit for unit in self.symbols}
+        table = DimensionTable(table._buffer)
+        table._units = tuple(units[symbol] for symbol in table.symbols)
+        self._precomputed = table
+
+    def _simplify(self, dimension):
+        """Applies the conversions to a dimension vector with whole
+        exponents."""
+        state = list(dimension) + [0] * (len(self.symbols) - len(dimension))
+        order = [i for i, x in enumerate(dimension) if x]
+        positive = _mask(state, 1)
+        negative = _mask(state, -1)
+        found = True
+        while found:
+            found = False
+            # Inlined version of _match_rule without a call per conversion
+            for rule_positive, rule_negative, conditions, vector, result, \
+                    reciprocal, match_exactly in self.rules:
+                if match_exactly:
+                    if rule_positive == positive and \
+                            rule_negative == negative and state == vector:
+                        state = [0] * len(state)
+                        state[result] = 1
+                        order = [result]
+                        found = True
+                elif not rule_positive & ~positive and \
+                        not rule_negative & ~negative and \
+                        all(state[i] >= x if x > 0 else state[i] <= x
+                            for i, x in conditions):
+                    _apply_rule(state, order, conditions, result, 1)
+                    found = True
+                elif reciprocal and not rule_positive & ~negative and \
+                        not rule_negative & ~positive and \
+                        all(state[i] <= -x if x > 0 else state[i] >= -x
+                            for i, x in conditions):
+                    _apply_rule(state, order, conditions, result, -1)
+                    found = True
+                if found:
+                    positive = _mask(state, 1)
+                    negative = _mask(state, -1)
+                    break
+        return tuple((self.symbols[i], state[i]) for i in order)
+
+    def _simplify_traced(self, dimension, trace):
+        """Applies the conversions like :meth:`_simplify` and appends the
+        applied conversions to a list. Used while the
+        :data:`instrumentation` is enabled.
+
+        Args:
+            dimension (tuple): Dimension vector over the SI base units.
+            trace (list): List the applied conversions are appended to.
+        """
+        state = list(dimension) + [0] * (len(self.symbols) - len(dimension))
+        order = [i for i, x in enumerate(dimension) if x]
+        found = True
+        while found:
+            found = False
+            positive = _mask(state, 1)
+            negative = _mask(state, -1)
+            for index, rule in enumerate(self.rules):
+                sign = _match_rule(rule, state, positive, negative)
+                if sign:
+                    _apply_rule(state, order, rule[2], rule[4], sign)
+                    trace.append(self.table[index])
+                    found = True
+                    break
+        return tuple((self.symbols[i], state[i]) for i in order)
+
+    def search(self, dimension):
+        """Finds the representation of a dimension vector with whole
+        exponents which needs the fewest units.
+
+        Starting from the result of the greedy search, every conversion
+        which divides a representation is applied in both directions and
+        the representations are examined in the order of their number of
+        units and the sum of their absolute exponents. The search stops when
+        the budget of examined representations is exhausted, so the result
+        is never longer than the greedy one. The results of the least
+        recently used dimensions are evicted from a
+        :class:`.SimplificationCache` of 1024 entries.
+
+        Args:
+            dimension (tuple): Dimension vector over the SI base units.
+
+        Returns:
+            tuple: Pairs of :class:`.NamedUnit` and exponent in the order of
+                   the representation.
+        """
+        entry = self._searched.get(dimension, self)
+        if entry is not None:
+            return entry[1]
+        greedy = self._simplify(dimension)
+        best = greedy
+        best_cost = (len(greedy), sum(abs(x) for _, x in greedy))
+        state = [0] * len(self.symbols)
+        for unit, exponent in greedy:
+            state[self._index[unit]] = exponent
+        start = list(dimension) + [0] * (len(self.symbols) - len(dimension))
+        seen = {tuple(state), tuple(start)}
+        heap = [(best_cost, 0, state, [self._index[unit] for unit, _
+                                       in greedy]),
+                ((sum(1 for x in start if x), sum(abs(x) for x in start)), 1,
+                 start, [i for i, x in enumerate(dimension) if x])]
+        count = 2
+        budget = self.budget
+        while heap and budget > 0:
+            cost, _, state, order = heapq.heappop(heap)
+            budget -= 1
+            if cost < best_cost:
+                best = tuple((self.symbols[i], state[i]) for i in order)
+                best_cost = cost
+            if cost[0] <= 1:
+                # No representation needs fewer units
+                break
+            positive = _mask(state, 1)
+            negative = _mask(state, -1)
+            for rule in self.rules:
+                sign = _match_rule(rule, state, positive, negative)
+                if sign:
+                    successor = list(state)
+                    successor_order = list(order)
+                    _apply_rule(successor, successor_order, rule[2],
+                                rule[4], sign)
+                    key = tuple(successor)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    heapq.heappush(heap, (
+                        (len(successor_order),
+                         sum(abs(x) for x in successor)),
+                        count, successor, successor_order))
+                    count += 1
+        self._searched.put(dimension, (self, best))
+        return best
+
+
+def _mask(vector, sign):
+    """Returns a bit mask of the entries of the vector with the given
+    sign."""
+    mask = 0
+    for i, x in enumerate(vector):
+        if x * sign > 0:
+            mask |= 1 << i
+    return mask
+
+
+def _match_rule(rule, state, positive, negative):
+    """Returns 1 if a compiled conversion divides the state, -1 if its
+    reciprocal divides the state and 0 otherwise.
+
+    Args:
+        rule (tuple): Compiled conversion of a :class:`.ConversionMatcher`.
+        state (list): Exponents of the symbols of the matcher.
+        positive (int): Bit mask of the positive exponents of the state.
+        negative (int): Bit mask of the negative exponents of the state.
+    """
+    rule_positive, rule_negative, conditions, vector, _, reciprocal, \
+        match_exactly = rule
+    if match_exactly:
+        return 1 if rule_positive == positive and \
+            rule_negative == negative and state == vector else 0
+    if not rule_positive & ~positive and not rule_negative & ~negative and \
+            all(state[i] >= x if x > 0 else state[i] <= x
+                for i, x in conditions):
+        return 1
+    # A conversion and its reciprocal never divide the same state, since
+    # the signs of the state would have to be opposite
+    if reciprocal and not rule_positive & ~negative and \
+            not rule_negative & ~positive and \
+            all(state[i] <= -x if x > 0 else state[i] >= -x
+                for i, x in conditions):
+        return -1
+    return 0
+
+
+def _apply_rule(state, order, conditions, result, sign):
+    """Replaces the units of a conversion by its result in place."""
+    for i, x in conditions:
+        state[i] -= sign * x
+        if not state[i]:
+            order.remove(i)
+    previous = state[result]
+    state[result] += sign
+    if not previous:
+        order.append(result)
+    elif not state[result]:
+        order.remove(result)
+
+
+class UnitRegistry:
+    """Holds the named units, the conversions and the priority lists which
+    are used to create and represent :class:`.Unit` instances.
+
+    A registry can be extended with :meth:`define`, :meth:`add_unit`,
+    :meth:`add_conversion` and :meth:`add_priority` until it is frozen.
+    Freezing precomputes the symbol table and the look up tables of all
+    priorities, so units of a frozen registry never check the registry for
+    changes. Registries are independent of each other, the
+    :data:`default_registry` uses the module attributes ``si_units``,
+    ``conversion_list`` and ``priority_dict``.
+
+    By default units are represented by the greedy conversion search. With a
+    search budget the representation with the fewest units is searched
+    instead, see :meth:`set_search_budget`.
+
+    Attributes:
+        generation (int): Counter which changes whenever the units, the
+                          conversions or the priority lists are changed by
+                          the methods of the registry or by
+                          :meth:`invalidate`.
+    """
+
+    def __init__(self, units=None, conversions=None, priorities=None,
+                 aliases=None, search_budget=None):
+        """Initializes the UnitRegistry class.
+
+        The given containers are used without copying them.
+
+        Args:
+            units (dict): Maps names to :class:`.NamedUnit`. Defaults to the
+                          SI base units.
+            conversions (list): List of :class:`.Conversion`.
+            priorities (dict): Maps priority names to lists of indexes into
+                               the conversions. Defaults to a single
+                               "default" priority.
+            aliases (dict): Maps alternative spellings accepted by the parser
+                            to unit symbols.
+            search_budget (int): Maximum number of representations examined
+                                 when searching the shortest representation.
+                                 Defaults to None for the greedy search.
+        """
+        self.units = dict(si_base_units) if units is None else units
+        self.conversions = [] if conversions is None else conversions
+        self.priorities = {"default": list(range(len(self.conversions)))} \
+            if priorities is None else priorities
+        self.aliases = {} if aliases is None else aliases
+        self.search_budget = search_budget
+        self.scaled_symbols = {}
+        self.frozen = False
+        self.generation = 0
+        self._tables = {}
+        self._lock = threading.Lock()
+        self._update()
+
+    def _update(self):
+        """Rebuilds the symbol table after the units or conversions
+        changed."""
+        unit_dimensions = {unit: dimension_of((unit,), ())
+                           for unit in base_units}
+        # Resolve conversions until no further result gets a dimension
+        changed = True
+        while changed:
+            changed = False
+            for conversion in self.conversions:
+                if conversion.result in unit_dimensions:
+                    continue
+                if not all(unit in unit_dimensions
+                           for unit in conversion.exponents):
+                    continue
+                dimension = [0] * len(base_units)
+                for unit, exponent in conversion.exponents.items():
+                    for index, x in enumerate(unit_dimensions[unit]):
+                        dimension[index] += exponent * x
+                unit_dimensions[conversion.result] = tuple(dimension)
+                changed = True
+        self.unit_dimensions = unit_dimensions
+        self.symbol_dimensions = {repr(unit): dimension for unit, dimension
+                                  in unit_dimensions.items()}
+        # Reverse indexes of the named units by quantity and dimension
+        quantity_units = {}
+        dimension_units = {}
+        for unit, dimension in unit_dimensions.items():
+            quantity_units.setdefault(unit.quantity, unit)
+            dimension_units[dimension] = \
+                dimension_units.get(dimension, ()) + (unit,)
+        self.quantity_units = quantity_units
+        self.dimension_units = dimension_units
+        symbols = {symbol: (dimension, 0) for symbol, dimension
+                   in self.symbol_dimensions.items()}
+        symbols.update(self.scaled_symbols)
+        if "kg" in symbols:
+            symbols.setdefault("g", (symbols["kg"][0], -3))
+        for alias, symbol in self.aliases.items():
+            if symbol in symbols:
+                symbols.setdefault(alias, symbols[symbol])
+        # Prefixed symbols never shadow symbols without prefix
+        prefixed = {}
+        for prefix, prefix_scale in si_prefixes.items():
+            for symbol, (dimension, scale) in symbols.items():
+                if symbol != "kg":
+                    prefixed.setdefault(prefix + symbol,
+                                        (dimension, scale + prefix_scale))
+        prefixed.update(symbols)
+        self.symbols = prefixed
+        self._parse_cache = lru_cache(maxsize=4096)(self._parse)
+        self.generation += 1
+
+    def _check_mutable(self):
+        if self.frozen:
+            raise RuntimeError("Cannot modify a frozen registry")
+
+    def add_unit(self, name, unit):
+        """Adds a named unit which can then be used in conversions.
+
+        Args:
+            name (str): Name of the unit in :attr:`units`.
+            unit (NamedUnit): The unit.
+        """
+        self._check_mutable()
+        self.units[name] = unit
+
+    def add_conversion(self, conversion, priorities=None):
+        """Appends a conversion to the conversions and to priority lists.
+
+        Args:
+            conversion (Conversion): The conversion.
+            priorities (iterable): Names of the priority lists the conversion
+                                   is appended to. Defaults to all.
+
+        Returns:
+            int: Index of the conversion.
+        """
+        self._check_mutable()
+        self.conversions.append(conversion)
+        index = len(self.conversions) - 1
+        if priorities is None:
+            priorities = list(self.priorities)
+        for priority in priorities:
+            self.priorities[priority].append(index)
+        self._update()
+        return index
+
+    def add_priority(self, name, indexes):
+        """Adds a priority list.
+
+        Args:
+            name (str): Name of the priority.
+            indexes (list): Indexes into the conversions in the order they
+                            should be tried.
+        """
+        self._check_mutable()
+        self.priorities[name] = list(indexes)
+        self.generation += 1
+
+    def invalidate(self):
+        """Rebuilds the symbol table and checks the look up tables against
+        the conversions and the priority lists on their next use.
+
+        Appending to or removing from the lists is noticed without calling
+        this method, replacing a conversion or an index in place is not.
+        """
+        self._check_mutable()
+        with self._lock:
+            self._update()
+
+    def set_search_budget(self, budget):
+        """Switches between the greedy conversion search and the search for
+        the representation with the fewest units.
+
+        The shortest representation is searched among the representations
+        reachable by applying the conversions of the priority list in any
+        order. Every distinct dimension is only searched once per look up
+        table. Units which were resolved before are resolved again.
+
+        Args:
+            budget (int): Maximum number of representations examined per
+                          dimension or None for the greedy search.
+        """
+        self._check_mutable()
+        if budget is not None and budget < 1:
+            raise ValueError("The search budget has to be positive")
+        with self._lock:
+            self.search_budget = budget
+            self._tables = {}
+            self.generation += 1
+
+    def use_dimension_table(self, priority, path=None, bound=4):
+        """Resolves the dimensions of a priority list with bounded exponents
+        by a precomputed :class:`.DimensionTable`.
+
+        The table is memory-mapped from the file if it exists and was built
+        for the current conversions. Otherwise it is built and written to
+        the file if a path is given. The table is dropped when the look up
+        table is rebuilt.
+
+        Args:
+            priority (str): Name of the priority list.
+            path (str): Path of the table file.
+            bound (int): Largest absolute exponent of a table which is
+                         built.
+
+        Returns:
+            DimensionTable: The table.
+        """
+        matcher = self.look_up_table(priority).matcher
+        table = None
+        if path is not None and os.path.exists(path):
+            table = DimensionTable.load(path)
+            if table.fingerprint != matcher.fingerprint:
+                table = None
+        if table is None:
+            table = DimensionTable.build(priority, bound, self)
+            if path is not None:
+                table.save(path)
+        matcher.attach(table)
+        return table
+
+    def define(self, symbol, quantity, expression, priorities=None):
+        """Defines a new named unit by a unit expression.
+
+        Units scaled by a power of ten like ``"10^5*Pa"`` can be parsed and
+        created but are represented by SI units, so no conversion is added
+        for them. Units store their scale as a power of ten, so other
+        factors are not supported and units like eV or Wh, which are
+        ``1.602176634e-19*J`` and ``3600*J``, cannot be defined.
+
+        Args:
+            symbol (str): Symbol of the unit.
+            quantity (str): Name of the quantity.
+            expression (str): Unit expression like ``"kg*m^2/s^2"`` which
+                              the unit is converted from.
+            priorities (iterable): Names of the priority lists the conversion
+                                   is appended to. Defaults to all.
+
+        Returns:
+            NamedUnit: The new unit.
+        """
+        self._check_mutable()
+        dimension, scale = self.parse(expression)
+        if any(type(x) is not int for x in dimension):
+            raise ValueError("Units can only be defined with whole "
+                             "exponents")
+        unit = NamedUnit(symbol, quantity)
+        self.add_unit(symbol, unit)
+        if scale:
+            self.scaled_symbols[symbol] = (dimension, scale)
+            self._update()
+            return unit
+        self.add_conversion(Conversion(
+            tuple(_expand(zip(base_units, dimension), 1)),
+            tuple(_expand(zip(base_units, dimension), -1)), unit),
+            priorities)
+        return unit
+
+    def freeze(self):
+        """Makes the registry immutable and precomputes the symbol table and
+        the look up tables of all priorities.
+
+        Returns:
+            UnitRegistry: The registry itself.
+        """
+        with self._lock:
+            if not self.frozen:
+                self.conversions = tuple(self.conversions)
+                self.priorities = {name: tuple(indexes) for name, indexes
+                                   in self.priorities.items()}
+                self._update()
+                self._tables = {name: _LookUpTable(indexes, self.conversions,
+                                                   self.search_budget)
+                                for name, indexes in self.priorities.items()}
+                self.frozen = True
+        return self
+
+    def __reduce__(self):
+        return _rebuild_registry, (
+            self.units, list(self.conversions),
+            {name: list(indexes) for name, indexes in self.priorities.items()},
+            self.aliases, self.scaled_symbols, self.frozen,
+            self.search_budget)
+
+    def copy(self):
+        """Returns an independent, not frozen copy of the registry."""
+        registry = UnitRegistry(dict(self.units), list(self.conversions),
+                                {name: list(indexes) for name, indexes
+                                 in self.priorities.items()},
+                                dict(self.aliases), self.search_budget)
+        registry.scaled_symbols.update(self.scaled_symbols)
+        registry._update()
+        return registry
+
+    def look_up_table(self, priority):
+        """Returns the conversions sorted by the given priority.
+
+        The table of a registry which is not frozen is rebuilt when the
+        conversions or the priority list changed since the last call. The
+        lists are only compared entry by entry when the :attr:`generation`
+        of the registry or their lengths changed, see :meth:`invalidate`.
+        Tables are shared between all threads and their conversions are not
+        modified after they were built.
+
+        Args:
+            priority (str): Name of the priority list.
+        """
+        indexes = self.priorities.get(priority)
+        if indexes is None:
+            raise ValueError("Unknown priority '{}'".format(priority))
+        table = self._tables.get(priority)
+        if self.frozen or table is not None and \
+                table.is_valid(self, priority):
+            return table
+        with self._lock:
+            table = self._tables.get(priority)
+            if table is None or \
+                    not table.is_current(indexes, self.conversions):
+                # Tables of earlier generations are not valid anymore
+                self.generation += 1
+                table = _LookUpTable(tuple(indexes), tuple(self.conversions),
+                                     self.search_budget)
+                self._tables[priority] = table
+            table.generation = self.generation
+        return table
+
+    def named_units(self, dimension):
+        """Returns the named units with a dimension.
+
+        Args:
+            dimension (tuple): Dimension vector over the SI base units.
+
+        Returns:
+            tuple: The :class:`.NamedUnit` instances in the order of the
+                   registry.
+        """
+        return self.dimension_units.get(tuple(dimension), ())
+
+    def parse_dimension(self, string):
+        """Returns the dimension vector of a unit expression.
+
+        Args:
+            string (str): Unit expression like ``"(m*kg)/(s^3*A)"``.
+        """
+        return self.parse(string)[0]
+
+    def parse(self, string):
+        """Returns the dimension vector and the power of ten of a unit
+        expression. Results are memoized.
+
+        Args:
+            string (str): Unit expression like ``"mV/(kg*m^2)"``.
+        """
+        return self._parse_cache(string)
+
+    def _parse(self, string):
+        """Parses a unit expression without memoization.
+
+        Args:
+            string (str): Unit expression like ``"(m*kg)/(s^3*A)"``.
+        """
+        parser = _Parser(tokenize(string), string, self)
+        dimension, scale = parser.expression()
+        if parser.position != len(parser.tokens):
+            parser.fail()
+        return dimension, scale
+
+
+def _rebuild_registry(units, conversions, priorities, aliases,
+                      scaled_symbols, frozen, search_budget=None):
+    """Recreates a pickled registry."""
+    registry = UnitRegistry(units, conversions, priorities, aliases,
+                            search_budget)
+    registry.scaled_symbols.update(scaled_symbols)
+    registry._update()
+    if frozen:
+        registry.freeze()
+    return registry
+
+
+def look_up_table(priority):
+    """Returns the conversions of the default registry sorted by the given
+    priority.
+
+    Args:
+        priority (str): Key of the priority list in ``priority_dict``.
+    """
+    return default_registry.look_up_table(priority)
+
+
+class _LookUpTable:
+    """Conversions of a priority list and their compiled matcher together
+    with the conversions and the priority list they were built from."""
+
+    def __init__(self, indexes, conversions, budget=None):
+        self.indexes = indexes
+        self.conversions = conversions
+        self.table = tuple(conversions[x] for x in indexes)
+        self.matcher = ConversionMatcher(self.table, budget)
+        # Generation of the registry the table was last checked in
+        self.generation = None
+
+    def is_valid(self, registry, priority):
+        """Returns whether the table was checked in the current generation
+        of a registry and the lengths of its lists did not change since."""
+        return self.generation == registry.generation and \
+            len(self.indexes) == len(registry.priorities[priority]) and \
+            len(self.conversions) == len(registry.conversions)
+
+    def is_current(self, indexes, conversions):
+        """Returns whether the table matches the priority list and the
+        conversions."""
+        return self.indexes == tuple(indexes) and \
+            len(self.conversions) == len(conversions) and \
+            all(x is y for x, y in zip(self.conversions, conversions))
+
+
+class DimensionTable:
+    """Precomputed representations of all dimensions with bounded exponents
+    for one look up table.
+
+    The table covers the SI base units which occur in a conversion with
+    exponents from ``-bound`` to ``bound``, all other exponents have to be
+    0. It is stored as an array of offsets indexed directly by the exponent
+    vector and the pairs of unit and exponent of the representations. The
+    binary form can be written to a file once, for example when installing,
+    and memory-mapped by every process with :meth:`load`.
+    """
+
+    _magic = b"UNITDT1\0"
+    _header = struct.Struct("<8sI")
+
+    def __init__(self, buffer):
+        """Initializes the DimensionTable class.
+
+        Args:
+            buffer (bytes, mmap.mmap): Binary form of the table.
+        """
+        magic, length = self._header.unpack_from(buffer)
+        if magic != self._magic:
+            raise ValueError("Not a dimension table")
+        start = self._header.size
+        header = json.loads(bytes(buffer[start:start + length]).decode())
+        self.bound = header["bound"]
+        self.axes = tuple(header["axes"])
+        self.symbols = tuple(header["symbols"])
+        self.fingerprint = header["fingerprint"]
+        self._units = ()
+        self._buffer = buffer
+        self._offsets = start + length
+        self._data = self._offsets + 4 * ((2 * self.bound + 1) **
+                                          len(self.axes) + 1)
+        self._passive = tuple(i for i in range(len(base_units))
+                              if i not in self.axes)
+
+    @classmethod
+    def build(cls, priority="default", bound=4, registry=None):
+        """Resolves all dimensions with bounded exponents.
+
+        Args:
+            priority (str): Name of the priority list.
+            bound (int): Largest absolute exponent of the table.
+            registry (UnitRegistry): Registry of the conversions. Defaults to
+                                     the :data:`default_registry`.
+        """
+        if registry is None:
+            registry = default_registry
+        matcher = registry.look_up_table(priority).matcher
+        symbols = [repr(unit) for unit in matcher.symbols]
+        axes = matcher.axes
+        offsets = [0]
+        data = bytearray()
+        for exponents in itertools.product(range(-bound, bound + 1),
+                                           repeat=len(axes)):
+            dimension = [0] * len(base_units)
+            for index, exponent in zip(axes, exponents):
+                dimension[index] = exponent
+            for unit, exponent in matcher.simplify(tuple(dimension)):
+                data += struct.pack("<Bb", symbols.index(repr(unit)),
+                                    exponent)
+            offsets.append(len(data) // 2)
+        header = json.dumps({"bound": bound, "axes": axes,
+                             "symbols": symbols,
+                             "fingerprint": matcher.fingerprint}).encode()
+        return cls(cls._header.pack(cls._magic, len(header)) + header +
+                   struct.pack("<{}I".format(len(offsets)), *offsets) +
+                   bytes(data))
+
+    @classmethod
+    def load(cls, path):
+        """Memory-maps a table written by :meth:`save`.
+
+        Args:
+            path (str): Path of the file.
+        """
+        with open(path, "rb") as file:
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def save(self, path):
+        """Writes the binary form of the table to a file.
+
+        Args:
+            path (str): Path of the file.
+        """
+        with open(path, "wb") as file:
+            file.write(self._buffer)
+
+    def look_up(self, dimension):
+        """Returns the representation of a dimension vector or None if the
+        dimension is not covered by the table.
+
+        Args:
+            dimension (tuple): Dimension vector with whole exponents.
+        """
+        bound = self.bound
+        index = 0
+        for axis in self.axes:
+            exponent = dimension[axis]
+            if not -bound <= exponent <= bound:
+                return None
+            index = index * (2 * bound + 1) + exponent + bound
+        for axis in self._passive:
+            if dimension[axis]:
+                return None
+        start, end = struct.unpack_from("<II", self._buffer,
+                                        self._offsets + 4 * index)
+        units = self._units
+        return tuple((units[unit], exponent) for unit, exponent
+                     in struct.iter_unpack("<Bb", self._buffer[
+                         self._data + 2 * start:self._data + 2 * end]))
+
+
+class Instrumentation:
+    """Opt-in counters of unit constructions, arithmetic operations and the
+    conversion search.
+
+    While enabled, the construction of units, the arithmetic operators of
+    :class:`.Unit` and the greedy conversion search are replaced by
+    counting versions. Every unit returned by the constructor, by
+    arithmetic, :meth:`.Unit.parse` or :meth:`.Unit.from_bytes` counts as
+    a construction, including units which were already interned.
+    Disabling restores the original methods, so the instrumentation costs
+    nothing while it is disabled. Only searches which miss the
+    :data:`simplification_cache` are counted.
+
+    Attributes:
+        constructions (int): Number of :class:`.Unit` constructions.
+        operations (Counter): Number of arithmetic operations by operator.
+        iterations (int): Number of iterations of the conversion search.
+        conversions (Counter): Number of applications by conversion.
+        histogram (Counter): Number of searches by their iterations.
+        searches (Counter): Iterations of the searches by the resulting
+                            representation.
+    """
+
+    # Operators which are counted, the reflected operators count as the
+    # operator itself
+    _operators = {"__mul__": "mul", "__rmul__": "mul",
+                  "__truediv__": "truediv", "__rtruediv__": "truediv",
+                  "__floordiv__": "floordiv", "__rfloordiv__": "floordiv",
+                  "__pow__": "pow", "__add__": "add", "__sub__": "sub"}
+
+    def __init__(self):
+        """Initializes the Instrumentation class."""
+        self.enabled = False
+        self._originals = []
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Sets all counters to zero."""
+        self.constructions = 0
+        self.operations = Counter()
+        self.iterations = 0
+        self.conversions = Counter()
+        self.histogram = Counter()
+        self.searches = Counter()
+
+    def enable(self):
+        """Starts counting."""
+        if self.enabled:
+            return
+        self._originals = [(Unit, name, Unit.__dict__[name])
+                           for name in ("_from_dimension", "_from_fixed")]
+        self._originals += [(Unit, name, Unit.__dict__[name])
+                            for name in self._operators]
+        self._originals.append((ConversionMatcher, "_simplify",
+                                ConversionMatcher.__dict__["_simplify"]))
+        for name in ("_from_dimension", "_from_fixed"):
+            setattr(Unit, name, classmethod(self._count_construction(
+                Unit.__dict__[name].__func__)))
+        for name, operator in self._operators.items():
+            setattr(Unit, name, self._count_operation(Unit.__dict__[name],
+                                                      operator))
+        ConversionMatcher._simplify = self._trace_search()
+        self.enabled = True
+
+    def disable(self):
+        """Stops counting and restores the original methods."""
+        if not self.enabled:
+            return
+        for cls, name, method in self._originals:
+            setattr(cls, name, method)
+        self.enabled = False
+
+    def export(self, callback=None):
+        """Returns the counters as a dict.
+
+        Args:
+            callback (callable): Function which is called with the dict.
+        """
+        with self._lock:
+            counters = {
+                "constructions": self.constructions,
+                "operations": dict(self.operations),
+                "iterations": self.iterations,
+                "conversions": dict(self.conversions),
+                "histogram": dict(self.histogram),
+                "searches": dict(self.searches)}
+        if callback is not None:
+            callback(counters)
+        return counters
+
+    def _count_construction(self, construct):
+        def counted_construction(cls, *args, **kwargs):
+            with self._lock:
+                self.constructions += 1
+            return construct(cls, *args, **kwargs)
+        return counted_construction
+
+    def _trace_search(self):
+        def traced_simplify(matcher, dimension):
+            trace = []
+            reduced = matcher._simplify_traced(dimension, trace)
+            # The last iteration finds no further conversion
+            self._record_search(reduced, len(trace) + 1, trace)
+            return reduced
+        return traced_simplify
+
+    def _count_operation(self, method, operator):
+        def counted_operation(*args):
+            with self._lock:
+                self.operations[operator] += 1
+            return method(*args)
+        return counted_operation
+
+    def _record_search(self, reduced, iterations, applied):
+        """Records a conversion search."""
+        with self._lock:
+            self.iterations += iterations
+            self.histogram[iterations] += 1
+            self.searches[format_fraction(
+                [(unit, exponent) for unit, exponent in reduced
+                 if exponent > 0],
+                [(unit, -exponent) for unit, exponent in reduced
+                 if exponent < 0])] += iterations
+            for conversion in applied:
+                self.conversions["{} -> {}".format(
+                    convert_fraction_to_string(conversion.numerators,
+                                               conversion.denominators),
+                    conversion.result)] += 1
+
+
+class SimplificationCache:
+    """Bounded LRU cache for the representations of resolved dimensions.
+
+    The :data:`simplification_cache` keys its entries by the dimension
+    vector, the conversion priority and the registry, every
+    :class:`.ConversionMatcher` with a search budget keeps the searched
+    representations in its own cache keyed by the dimension vector. Every
+    entry starts with the look up table or matcher it was computed with, so
+    entries computed before a change of ``conversion_list`` or
+    ``priority_dict`` are treated as misses.
+    """
+
+    def __init__(self, maxsize=1024):
+        """Initializes the SimplificationCache class.
+
+        Args:
+            maxsize (int): Maximum number of cached representations. A size
+                           of 0 disables the cache.
+        """
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, table):
+        """Returns the cached entry for the key or None.
+
+        Args:
+            key (tuple): Dimension vector, priority and registry, or only the
+                         dimension vector in the cache of a matcher.
+            table (object): Current look up table of the priority, or the
+                            matcher. Entries computed with another one are
+                            misses.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] is not table:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        """Stores an entry and evicts the least recently used ones.
+
+        Args:
+            key (tuple): Dimension vector, priority and registry, or only the
+                         dimension vector in the cache of a matcher.
+            entry (tuple): Look up table, pairs of unit and exponent and
+                           representation, or the matcher and the pairs of
+                           unit and exponent in the cache of a matcher.
+        """
+        with self._lock:
+            if self.maxsize <= 0:
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def resize(self, maxsize):
+        """Sets the maximum number of entries and evicts surplus entries.
+
+        Args:
+            maxsize (int): New maximum number of cached representations.
+        """
+        with self._lock:
+            self.maxsize = maxsize
+            while self._entries and len(self._entries) > max(maxsize, 0):
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Removes all entries and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def info(self):
+        """Returns the counters and the size of the cache as a dict."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions,
+                    "size": len(self._entries), "maxsize": self.maxsize}
+
+    def __len__(self):
+        return len(self._entries)
+
+
+simplification_cache = SimplificationCache()
+
+instrumentation = Instrumentation()
+
+default_registry = UnitRegistry(si_units, conversion_list, priority_dict,
+                                symbol_aliases)
+
+symbol_dimensions = default_registry.symbol_dimensions
+
+# Compile the look up tables of the SI units once at import
+for _priority in priority_dict:
+    default_registry.look_up_table(_priority)
+
+# Conversion priority of the current thread or asyncio task
+_priority_context = ContextVar("conversion_priority", default=None)
+
+
+@contextmanager
+def priority_context(priority, registry=None):
+    """Context manager setting the conversion priority of units created in
+    the current thread or asyncio task.
+
+    Args:
+        priority (str): Key of the priority list in ``priority_dict``.
+        registry (UnitRegistry): Registry the priority is checked against.
+                                 Defaults to the :data:`default_registry`.
+    """
+    if registry is None:
+        registry = default_registry
+    if registry.priorities.get(priority) is None:
+        raise ValueError("Unknown priority '{}'".format(priority))
+    token = _priority_context.set(priority)
+    try:
+        yield
+    finally:
+        _priority_context.reset(token)
+
+
+# Maps dimension vector and conversion priority to the shared unit instance
+_interned_units = weakref.WeakValueDictionary()
+
 
 class Unit:
-    """Represents a Unit by storing the numerator and the denominators of the
-    unit as SI units. Supports arithmetic operations like multiplying and
+    """Represents a Unit by storing the exponents of the SI base units as a
+    dimension vector. Supports arithmetic operations like multiplying and
     dividing with other :class:`.Unit` instances. When representing the unit,
     an algorithm tries to find the best fitting unit out of the SI units via
-    a lookup table.
+    a lookup table. Results of arithmetic operations keep the conversion
+    priority shared by their operands and otherwise use the priority of the
+    current context.
+
+    Attributes:
+        conversion_priority (str): Key of the priority list in
+                                   ``priority_dict`` used to resolve the
+                                   representation. It is the global default
+                                   which is overridden by
+                                   :func:`.priority_context`.
+        lazy (bool): When set to True the representation is resolved when it
+                     is accessed for the first time instead of on creation.
+        dimension (tuple): Exponents of the SI base units.
+        scale (int): Power of ten the unit is scaled with, for example -3 for
+                     ``mV``.
     """
 
+    __slots__ = ("dimension", "scale", "_priority", "_registry", "_entry",
+                 "__weakref__")
+
     conversion_priority = "default"
+    lazy = True
 
-    def __init__(self, numerators=None, denominators=None, fix_repr=False):
+    def __new__(cls, numerators=None, denominators=None, fix_repr=False,
+                priority=None, registry=None):
+        if registry is None:
+            registry = default_registry
+        if numerators is None:
+            numerators = []
+
+        if denominators is None:
+            denominators = []
+
+        if not isinstance(numerators, list):
+            raise ValueError("Numerators has to be list")
+        if not isinstance(denominators, list):
+            raise ValueError("Denominators has to be list")
+
+        symbols = registry.symbols
+        dimension = [0] * len(base_units)
+        scale = 0
+        # Sum up the dimensions of the given units
+        for sign, names in ((1, numerators), (-1, denominators)):
+            for name in names:
+                symbol = symbols.get(name)
+                if symbol is None:
+                    raise ValueError("Unknown unit '{}'".format(name))
+                for index, exponent in enumerate(symbol[0]):
+                    dimension[index] += sign * exponent
+                scale += sign * symbol[1]
+
+        if fix_repr is False:
+            return cls._from_dimension(tuple(dimension), priority, registry,
+                                       scale)
+        units = registry.units
+        reduced = [(units[numerator], count) for numerator, count
+                   in Counter(numerators).items() if numerator in units]
+        reduced += [(units[denominator], -count) for denominator, count
+                    in Counter(denominators).items() if denominator in units]
+        return cls._from_fixed(
+            tuple(dimension), scale, cls._check_priority(priority, registry),
+            registry, tuple(reduced),
+            (tuple(Counter(numerators).items()),
+             tuple(Counter(denominators).items())))
+
+    @classmethod
+    def _from_fixed(cls, dimension, scale, priority, registry, reduced,
+                    fraction):
+        """Returns a unit with fixed representation, which is not
+        interned.
+
+        Args:
+            fraction (tuple): Pairs of symbol and exponent of the given
+                              numerators and denominators, which every
+                              output style is rendered from.
+        """
+        unit = object.__new__(cls)
+        object.__setattr__(unit, "dimension", dimension)
+        object.__setattr__(unit, "scale", scale)
+        object.__setattr__(unit, "_priority", priority)
+        object.__setattr__(unit, "_registry", registry)
+        object.__setattr__(unit, "_entry", (
+            None, reduced, format_fraction(*fraction), fraction))
+        return unit
+
+    def __init__(self, numerators=None, denominators=None, fix_repr=False,
+                 priority=None, registry=None):
         """Initializes the Unit class.
 
+        Units with the same dimension and conversion priority are interned,
+        so creating a unit returns the already existing instance if there is
+        one. Units are immutable.
+
         Args:
             numerators (list): List of units which should be numerators.
+                               Units can have an SI prefix like ``"mV"``.
+                               Unknown units raise a ``ValueError``.
             denominators (list): List of units which should be denominators.
             fix_repr (bool): When set to True the repr of the unit will be the
                              exact same as given by parameters numerators and
                              denominators. This means there will be no
                              resolving of the unit via the conversion list.
+                             Units with fixed representation are not
+                             interned.
+            priority (str): Conversion priority for this unit. Defaults to
+                            the priority of the current context, see
+                            :func:`.priority_context`.
+            registry (UnitRegistry): Registry of the known units. Defaults
+                                     to the :data:`default_registry`.
         """
-        if priority_dict.get(self.conversion_priority) is None:
-            raise ValueError("Unknown priority '{}'".format(
-                self.conversion_priority))
-        if numerators is None:
-            numerators = []
+        # The unit is completely set up in __new__
 
-        if denominators is None:
-            denominators = []
+    @classmethod
+    def _from_dimension(cls, dimension, priority=None, registry=None,
+                        scale=0):
+        """Returns the interned unit of a dimension vector.
 
-        if not isinstance(numerators, list):
-            raise ValueError("Numerators has to be list")
-        if not isinstance(denominators, list):
-            raise ValueError("Denominators has to be list")
+        Args:
+            dimension (tuple): Exponents of the SI base units.
+            priority (str): Conversion priority. Defaults to the priority of
+                            the current context.
+            registry (UnitRegistry): Registry of the known units. Defaults
+                                     to the :data:`default_registry`.
+            scale (int): Power of ten the unit is scaled with.
+        """
+        if registry is None:
+            registry = default_registry
+        priority = cls._check_priority(priority, registry)
+        key = (dimension, scale, priority, registry)
+        unit = _interned_units.get(key)
+        if unit is not None:
+            return unit
+        unit = object.__new__(cls)
+        object.__setattr__(unit, "dimension", dimension)
+        object.__setattr__(unit, "scale", scale)
+        object.__setattr__(unit, "_priority", priority)
+        object.__setattr__(unit, "_registry", registry)
+        object.__setattr__(unit, "_entry", None)
+        if not cls.lazy:
+            unit._resolve()
+        return _interned_units.setdefault(key, unit)
 
-        self.numerators = []
-        self.denominators = []
-        self.repr = None
-        # Split given numerators into their SI base units if needed
-        for numerator in numerators:
-            if numerator in [repr(x) for x in si_base_units.values()]:
-                self.numerators.append(si_base_units[numerator])
-                continue
-            for conversion in si_base_conversions:
-                if repr(conversion.result) == numerator:
-                    self.numerators += conversion.numerators
-                    self.denominators += conversion.denominators
-                    continue
-        # Split given denominators into their SI base units if needed
-        for denominator in denominators:
-            if denominator in [repr(x) for x in si_base_units.values()]:
-                self.denominators.append(si_base_units[denominator])
-                continue
+    @classmethod
+    def _check_priority(cls, priority=None, registry=None):
+        """Returns the conversion priority used for the representation.
 
-            for conversion in si_base_conversions:
-                if repr(conversion.result) == denominator:
-                    self.numerators += conversion.denominators
-                    self.denominators += conversion.numerators
-                    continue
-        tmp = copy.copy(self.numerators)
-        # Reduce fraction
-        for numerator in tmp:
-            if numerator in self.denominators:
-                self.denominators.remove(numerator)
-                self.numerators.remove(numerator)
+        Args:
+            priority (str): Explicitly requested priority.
+            registry (UnitRegistry): Registry the priority has to exist in.
+        """
+        if priority is None:
+            priority = _priority_context.get()
+            if priority is None:
+                priority = cls.conversion_priority
+        if registry is None:
+            registry = default_registry
+        if registry.priorities.get(priority) is None:
+            raise ValueError("Unknown priority '{}'".format(priority))
+        return priority
 
-        if fix_repr is False:
-            self.reduced_numerators = copy.copy(self.numerators)
-            self.reduced_denominators = copy.copy(self.denominators)
-
-            look_up_table = [conversion_list[x] for x in
-                             priority_dict[Unit.conversion_priority]]
-            found = True
-            # Try to find conversion for the units
-            while found:
-                found = False
-                for conversion in look_up_table:
-                    if check_divider(conversion.numerators,
-                                     conversion.denominators,
-                                     self.reduced_numerators,
-                                     self.reduced_denominators) \
-                            and not conversion.match_exactly:
-                        for j in conversion.numerators:
-                            self.reduced_numerators.remove(j)
-                        for j in conversion.denominators:
-                            self.reduced_denominators.remove(j)
-                        self.reduced_numerators.append(conversion.result)
-                        found = True
-                        break
-
-                    elif check_divider(conversion.denominators,
-                                       conversion.numerators,
-                                       self.reduced_numerators,
-                                       self.reduced_denominators) and \
-                            conversion.reciprocal and \
-                            not conversion.match_exactly:
-                        for j in conversion.numerators:
-                            self.reduced_denominators.remove(j)
-                        for j in conversion.denominators:
-                            self.reduced_numerators.remove(j)
-                        self.reduced_denominators.append(conversion.result)
-                        found = True
-                        break
-                    elif conversion.match_exactly:
-                        if check_exact_match(conversion.numerators,
-                                             conversion.denominators,
-                                             self.reduced_numerators,
-                                             self.reduced_denominators):
-                            self.reduced_numerators = [conversion.result]
-                            self.reduced_denominators = []
-                            found = True
-                            break
-            self.repr = convert_fraction_to_string(self.reduced_numerators,
-                                                   self.reduced_denominators)
-        else:
-            self.reduced_numerators = [si_units.get(numerator) for numerator in numerators if si_units.get(numerator)]
-            self.reduced_denominators = [si_units.get(denominator) for denominator in denominators if si_units.get(denominator)]
-            self.repr = convert_fraction_to_string(numerators, denominators)
+    def _resolve(self):
+        """Finds the representation of the unit via the conversion list.
+
+        The representation is computed for the conversion priority which was
+        active when the unit was created and is stored on the instance. It is
+        computed again if the conversions or the priority list changed in the
+        meantime, see :meth:`.UnitRegistry.invalidate`.
+        """
+        entry = self._entry
+        priority = self._priority
+        registry = self._registry
+        if entry is not None:
+            table = entry[0]
+            if table is None:
+                return entry
+            if registry.frozen:
+                if table is registry._tables.get(priority):
+                    return entry
+            # Inlined _LookUpTable.is_valid, tables of registries which are
+            # not frozen are compared with the conversions and the priority
+            # lists once per generation of the registry
+            elif table.generation == registry.generation and \
+                    len(table.indexes) == len(registry.priorities[priority]) \
+                    and len(table.conversions) == len(registry.conversions):
+                return entry
+        table = registry.look_up_table(priority)
+        if entry is not None and entry[0] is table:
+            return entry
+        key = (self.dimension, priority, self._registry)
+        entry = simplification_cache.get(key, table)
+        if entry is None:
+            reduced = table.matcher.simplify(self.dimension)
+            entry = (table, reduced, format_fraction(
+                [(unit, exponent) for unit, exponent in reduced
+                 if exponent > 0],
+                [(unit, -exponent) for unit, exponent in reduced
+                 if exponent < 0]))
+            simplification_cache.put(key, entry)
+        if self.scale:
+            entry = (table, entry[1], format_prefixed(entry[1], self.scale))
+        object.__setattr__(self, "_entry", entry)
+        return entry
+
+    @property
+    def reduced(self):
+        """tuple: Pairs of :class:`.NamedUnit` and exponent of the
+        representation. Negative exponents are denominators."""
+        return self._resolve()[1]
+
+    @property
+    def reduced_numerators(self):
+        """list: Numerators of the representation."""
+        return _expand(self._resolve()[1], 1)
+
+    @property
+    def reduced_denominators(self):
+        """list: Denominators of the representation."""
+        return _expand(self._resolve()[1], -1)
+
+    @property
+    def repr(self):
+        """str: Representation of the unit."""
+        return self._resolve()[2]
+
+    @property
+    def registry(self):
+        """UnitRegistry: Registry of the known units of this unit."""
+        return self._registry
+
+    @property
+    def numerators(self):
+        """list: SI base units of the numerator derived from the dimension."""
+        return _expand(zip(base_units, self.dimension), 1)
+
+    @property
+    def denominators(self):
+        """list: SI base units of the denominator derived from the
+        dimension."""
+        return _expand(zip(base_units, self.dimension), -1)
+
+    def _common_priority(self, other):
+        """Returns the conversion priority of the result of an operation
+        with another unit. Results keep the priority both operands share,
+        otherwise the priority of the current context is used.
+
+        Args:
+            other (Unit): The other operand.
+        """
+        if self._priority == other._priority:
+            return self._priority
+        return None
 
     def __mul__(self, other):
         if isinstance(other, int):
             if other == 1:
-                return copy.copy(self)
+                return self
             else:
                 raise TypeError("Unsupported operand for integer other than 1")
-        result_numerators = copy.copy(self.numerators)
-        result_denominators = copy.copy(self.denominators)
-        # Add numerators of the other unit or reduce the fraction
-        for numerator in other.numerators:
-            if numerator in result_denominators:
-                result_denominators.remove(numerator)
-            else:
-                result_numerators.append(numerator)
-        # Add denominators of the other unit or reduce the fraction
-        for denominator in other.denominators:
-            if denominator in result_numerators:
-                result_numerators.remove(denominator)
-            else:
-                result_denominators.append(denominator)
-        return Unit([repr(x) for x in result_numerators],
-                    [repr(x) for x in result_denominators])
+        if not isinstance(other, Unit):
+            return NotImplemented
+        return Unit._from_dimension(tuple(
+            x + y for x, y in zip(self.dimension, other.dimension)),
+            self._common_priority(other), self._registry,
+            self.scale + other.scale)
 
     __rmul__ = __mul__
 
     def __floordiv__(self, other):
         if isinstance(other, int):
             if other == 1:
-                return copy.copy(self)
+                return self
             raise TypeError("Unsupported operand for integer other than 1")
-        return self * Unit([repr(x) for x in other.denominators],
-                           [repr(x) for x in other.numerators])
+        if not isinstance(other, Unit):
+            return NotImplemented
+        return Unit._from_dimension(tuple(
+            x - y for x, y in zip(self.dimension, other.dimension)),
+            self._common_priority(other), self._registry,
+            self.scale - other.scale)
 
     def __rfloordiv__(self, other):
         if isinstance(other, int):
             if other == 1:
-                return Unit([repr(x) for x in self.denominators],
-                            [repr(x) for x in self.numerators])
+                return Unit._from_dimension(tuple(
+                    -x for x in self.dimension), self._priority,
+                    self._registry, -self.scale)
             raise TypeError("Unsupported operand for integer other than 1")
+        return NotImplemented
 
     __truediv__ = __floordiv__
     __rtruediv__ = __rfloordiv__
 
     def __add__(self, other):
-        if Counter(self.numerators) == Counter(other.numerators) and \
-                Counter(self.denominators) == Counter(other.denominators):
-            return copy.copy(self)
+        if self.dimension == other.dimension and self.scale == other.scale:
+            return self
         else:
             raise ValueError("Cannot add unequal units")
 
@@ -284,31 +1619,330 @@ class Unit:
         return self + other
 
     def __pow__(self, power, modulo=None):
-        result = 1
         if power == 0:
-            return result
-        tmp = copy.copy(self)
-        for i in range(abs(power)):
-            result = result * tmp
-        if power < 0:
-            result = 1 / result
-        return result
+            return 1
+        if not isinstance(power, int):
+            if isinstance(power, float):
+                power = Fraction(power).limit_denominator()
+            power = _normalize_exponent(Fraction(power))
+        return Unit._from_dimension(tuple(
+            _normalize_exponent(x * power) for x in self.dimension),
+            self._priority, self._registry,
+            _normalize_exponent(self.scale * power))
 
     def __eq__(self, other):
-        if Counter(self.numerators) == Counter(other.numerators) \
-                and Counter(self.denominators) == Counter(other.denominators):
+        if self is other:
             return True
-        else:
-            return False
+        if not isinstance(other, Unit):
+            return NotImplemented
+        return self.dimension == other.dimension and self.scale == other.scale
+
+    def __hash__(self):
+        return hash((self.dimension, self.scale))
+
+    def is_compatible(self, other):
+        """Returns whether the unit has the same dimension as another unit,
+        so values can be converted between them.
+
+        Args:
+            other (Unit): The other unit.
+        """
+        return self is other or self.dimension == other.dimension
+
+    def conversion_factor(self, other):
+        """Returns the factor which converts values of this unit into values
+        of another unit with the same dimension.
+
+        Args:
+            other (Unit): Unit to convert to.
+        """
+        if not self.is_compatible(other):
+            raise ValueError("Cannot convert '{}' to '{}'".format(self, other))
+        exponent = self.scale - other.scale
+        if type(exponent) is int:
+            return 10.0 ** exponent
+        return 10.0 ** float(exponent)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Unit is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Unit is immutable")
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
     def __repr__(self):
         return self.repr
 
+    def __reduce__(self):
+        registry = None if self._registry is default_registry \
+            else self._registry
+        if self._entry is not None and self._entry[0] is None:
+            # Keep the fixed representation
+            return _restore_fixed_unit, (self.to_bytes(), registry,
+                                         self._entry[1], self._entry[3])
+        return Unit.from_bytes, (self.to_bytes(), registry)
+
+    def to_bytes(self):
+        """Returns a compact binary encoding of the unit.
+
+        The encoding holds the exponents, the power of ten and the id of the
+        conversion priority in the registry. It does not hold the registry.
+        Units with fixed representation are encoded like any other unit.
+        """
+        priority = list(self._registry.priorities).index(self._priority)
+        values = self.dimension + (self.scale,)
+        denominator = 1
+        for x in values:
+            if type(x) is not int:
+                denominator = denominator * x.denominator // gcd(
+                    denominator, x.denominator)
+        values = [int(x * denominator) for x in values]
+        width = 1 if all(-128 <= x <= 127 for x in values) else 2
+        try:
+            return _unit_formats[width].pack(width, priority, denominator,
+                                             *values)
+        except struct.error:
+            raise ValueError("Unit '{}' is too large to be encoded".format(
+                self))
+
+    @classmethod
+    def from_bytes(cls, data, registry=None):
+        """Creates the interned unit of an encoding of :meth:`to_bytes`.
+
+        Args:
+            data (bytes): The encoded unit.
+            registry (UnitRegistry): Registry the unit was encoded with.
+                                     Defaults to the :data:`default_registry`.
+        """
+        if registry is None:
+            registry = default_registry
+        if not data or data[0] not in _unit_formats:
+            raise ValueError("Invalid unit encoding")
+        try:
+            _, priority, denominator, *values = \
+                _unit_formats[data[0]].unpack(data)
+        except struct.error:
+            raise ValueError("Invalid unit encoding")
+        priorities = list(registry.priorities)
+        if denominator == 0 or priority >= len(priorities):
+            raise ValueError("Invalid unit encoding")
+        if denominator != 1:
+            values = [_normalize_exponent(Fraction(x, denominator))
+                      for x in values]
+        return cls._from_dimension(tuple(values[:-1]), priorities[priority],
+                                   registry, values[-1])
+
+    @classmethod
+    def parse(cls, string, priority=None, registry=None):
+        """Creates a unit from a string like ``"(m*kg)/(s^3*A)"``.
+
+        Accepts the syntax of the representation of units, so parsing the
+        representation of a unit returns an equal unit.
+
+        Args:
+            string (str): Unit expression made of unit symbols with optional
+                          SI prefix, ``*``, ``/``, ``^`` with integer
+                          exponents or fractional exponents like ``^(1/2)``,
+                          parentheses and powers of ten like ``1`` or
+                          ``10^-3``.
+            priority (str): Conversion priority for this unit. Defaults to
+                            the priority of the current context.
+            registry (UnitRegistry): Registry of the known units. Defaults
+                                     to the :data:`default_registry`.
+        """
+        if registry is None:
+            registry = default_registry
+        dimension, scale = registry.parse(string)
+        return cls._from_dimension(dimension, priority, registry, scale)
+
+    from_string = parse
+
+    def format(self, style="repr"):
+        """Returns the representation of the unit in an output style.
+
+        The results are cached per representation and style. Units with
+        fixed representation are rendered from the given units, so every
+        style shows the same units as the repr.
+
+        Args:
+            style (str): ``"repr"``, ``"ascii"``, ``"unicode"`` or
+                         ``"latex"``, see :func:`format_fraction`.
+        """
+        entry = self._resolve()
+        if style == "repr":
+            return entry[2]
+        if entry[0] is None:
+            # Fixed representations are rendered from the given units
+            return format_fraction(*entry[3], style=style)
+        return _render(entry[1], self.scale, style)
+
+    def __format__(self, format_spec):
+        return self.format(format_spec or "repr")
+
     @property
     def quantity(self):
-        """Returns the quantity of the unit if it is a known SI unit."""
-        if len(self.reduced_numerators) == 1 and not self.reduced_denominators:
-            return self.reduced_numerators[0].quantity
+        """Returns the quantity of the unit if its dimension is the dimension
+        of a named unit of the registry."""
+        units = self._registry.dimension_units.get(self.dimension)
+        if units:
+            return units[0].quantity
+
+    @property
+    def named_units(self):
+        """tuple: The :class:`.NamedUnit` instances with the dimension of the
+        unit."""
+        return self._registry.dimension_units.get(self.dimension, ())
+
+    @classmethod
+    def from_quantity(cls, quantity, priority=None, registry=None):
+        """Returns the unit of a quantity like ``"Magnetic flux"``.
+
+        Args:
+            quantity (str): Name of the quantity of a named unit.
+            priority (str): Conversion priority. Defaults to the priority of
+                            the current context.
+            registry (UnitRegistry): Registry of the known units. Defaults
+                                     to the :data:`default_registry`.
+        """
+        if registry is None:
+            registry = default_registry
+        unit = registry.quantity_units.get(quantity)
+        if unit is None:
+            raise ValueError("Unknown quantity '{}'".format(quantity))
+        return cls._from_dimension(registry.unit_dimensions[unit], priority,
+                                   registry)
+
+
+# Binary encodings of units with one and two bytes per exponent. Each holds
+# the width, the priority id, the common denominator of the exponents, the
+# exponents and the power of ten.
+_unit_formats = {1: struct.Struct("<BBB{}bb".format(len(base_units))),
+                 2: struct.Struct("<BBB{}hh".format(len(base_units)))}
+
+
+def _restore_fixed_unit(data, registry, reduced, fraction):
+    """Recreates a pickled unit with fixed representation."""
+    unit = Unit.from_bytes(data, registry)
+    return Unit._from_fixed(unit.dimension, unit.scale, unit._priority,
+                            unit._registry, reduced, fraction)
+
+
+def units_to_bytes(units):
+    """Encodes a sequence of units into a single bytes object.
+
+    Args:
+        units (iterable): :class:`.Unit` instances.
+    """
+    encodings = {}
+    parts = []
+    for unit in units:
+        key = (unit.dimension, unit.scale, unit._priority)
+        data = encodings.get(key)
+        if data is None:
+            data = encodings[key] = unit.to_bytes()
+        parts.append(data)
+    return b"".join(parts)
+
+
+def units_from_bytes(data, registry=None):
+    """Decodes units encoded with :func:`units_to_bytes`.
+
+    Every distinct encoding is only decoded once.
+
+    Args:
+        data (bytes): The encoded units.
+        registry (UnitRegistry): Registry the units were encoded with.
+                                 Defaults to the :data:`default_registry`.
+
+    Returns:
+        list: The interned units.
+    """
+    data = memoryview(data)
+    decoded = {}
+    units = []
+    position = 0
+    while position < len(data):
+        unit_format = _unit_formats.get(data[position])
+        if unit_format is None:
+            raise ValueError("Invalid unit encoding")
+        record = bytes(data[position:position + unit_format.size])
+        unit = decoded.get(record)
+        if unit is None:
+            unit = decoded[record] = Unit.from_bytes(record, registry)
+        units.append(unit)
+        position += unit_format.size
+    return units
+
+
+def _normalize_exponent(exponent):
+    """Returns whole exponents as int and fractional ones as Fraction."""
+    if type(exponent) is not int and exponent.denominator == 1:
+        return int(exponent)
+    return exponent
+
+
+def _expand(reduced, sign):
+    """Expands pairs of unit and exponent with the given sign into a list
+    with one entry per unit."""
+    units = []
+    for unit, exponent in reduced:
+        exponent *= sign
+        if exponent > 0:
+            if type(exponent) is not int:
+                raise ValueError("Units with fractional exponents cannot be "
+                                 "expanded into a list")
+            units += [unit] * exponent
+    return units
+
+
+def format_prefixed(reduced, scale, style="repr"):
+    """Converts pairs of unit and exponent scaled by a power of ten into a
+    string.
+
+    The scale is expressed by an SI prefix on the first unit which allows
+    it. If no unit allows it, the power of ten is put in front.
+
+    Args:
+        reduced (tuple): Pairs of unit and exponent. Negative exponents are
+                         denominators.
+        scale (int): Power of ten.
+        style (str): Output style, see :func:`format_fraction`.
+    """
+    numerators = [("{}".format(unit), exponent) for unit, exponent in reduced
+                  if exponent > 0]
+    denominators = [("{}".format(unit), -exponent) for unit, exponent
+                    in reduced if exponent < 0]
+    for items, sign in ((numerators, 1), (denominators, -1)):
+        for index, (symbol, exponent) in enumerate(items):
+            if type(exponent) is not int:
+                continue
+            if symbol == "kg":
+                # Prefixes of kilogram are applied to gram
+                symbol, offset = "g", 3
+            else:
+                offset = 0
+            prefix_scale = Fraction(scale, sign * exponent) + offset
+            if prefix_scale.denominator != 1:
+                continue
+            prefix = "" if prefix_scale == 0 and offset \
+                else _prefix_symbols.get(int(prefix_scale))
+            if prefix is not None:
+                items[index] = (prefix + symbol, exponent)
+                return format_fraction(numerators, denominators, style)
+    string = format_fraction(numerators, denominators, style)
+    if style == "latex":
+        factor, separator = "10^{{{}}}".format(scale), r" \cdot "
+    else:
+        power, separator = _styles[style]
+        factor = power(10, scale)
+    if string == "1":
+        return factor
+    return factor + separator + string
 
 
 def convert_fraction_to_string(numerators, denominators):
@@ -320,55 +1954,120 @@ def convert_fraction_to_string(numerators, denominators):
         denominators(list): List of units as the denominators. Can be unit
                             objects or strings.
     """
-    string_numerators = ""
-    string_denominators = ""
-    # Find duplicates and replace with them with the power of the units
-    duplicates = [(item, count) for item, count in Counter(numerators).items() if count > 1]
-    seen = set()
-    numerators = [x for x in numerators if not (x in seen or seen.add(x))]
-    for duplicate in duplicates:
-        for index, unit in enumerate(numerators):
-            if duplicate[0] == unit:
-                numerators[index] = "{}^{}".format(duplicate[0], duplicate[1])
-    # Put multiplication sign between every unit
-    for numerator in numerators:
-        if string_numerators:
-            string_numerators = "{}*{}".format(string_numerators, numerator)
-        else:
-            string_numerators = "{}".format(numerator)
-    # Find duplicates and replace with them with the power of the units
-    duplicates = [(item, count) for item, count in Counter(denominators).items() if count > 1]
-    seen = set()
-    denominators = [x for x in denominators if not (x in seen or seen.add(x))]
-    for duplicate in duplicates:
-        for index, unit in enumerate(denominators):
-            if duplicate[0] == unit:
-                denominators[index] = "{}^{}".format(duplicate[0], duplicate[1])
+    return format_fraction(Counter(numerators).items(),
+                           Counter(denominators).items())
+
+
+def format_fraction(numerators, denominators, style="repr"):
+    """Converts pairs of unit and exponent into a single fraction string.
+
+    The styles are ``"repr"`` like ``kΩ*m^2/(s^3*A)``, ``"ascii"`` like
+    ``kOhm*m^2/(s^3*A)``, ``"unicode"`` like ``kΩ·m²/(s³·A)`` and ``"latex"``
+    like ``\\frac{\\mathrm{k\\Omega} \\cdot \\mathrm{m}^{2}}{...}``.
+
+    Args:
+        numerators (iterable): Pairs of unit and positive exponent of the
+                               numerator. Units can be unit objects or
+                               strings.
+        denominators (iterable): Pairs of unit and positive exponent of the
+                                 denominator.
+        style (str): Output style.
+    """
+    if style == "latex":
+        return _format_latex(numerators, denominators)
+    if style not in _styles:
+        raise ValueError("Unknown style '{}'".format(style))
+    power, separator = _styles[style]
     # Put multiplication sign between every unit
-    for denominator in denominators:
-        if string_denominators:
-            string_denominators = "{}*{}".format(string_denominators,
-                                                 denominator)
-        else:
-            string_denominators = "{}".format(denominator)
+    string_numerators = separator.join(power(unit, exponent)
+                                       for unit, exponent in numerators)
+    string_denominators = separator.join(power(unit, exponent)
+                                         for unit, exponent in denominators)
     if not string_numerators and not string_denominators:
         return "1"
     elif string_numerators and not string_denominators:
         return string_numerators
     elif string_denominators and not string_numerators:
-        if "*" in string_denominators:
+        if separator in string_denominators:
             return "1/(" + string_denominators + ")"
         else:
             return "1/" + string_denominators
     else:
-        if "*" in string_numerators:
+        if separator in string_numerators:
             string_numerators = "(" + string_numerators + ")"
-        if "*" in string_denominators:
+        if separator in string_denominators:
             string_denominators = "(" + string_denominators + ")"
 
         return string_numerators + "/" + string_denominators
 
 
+def _format_power(unit, exponent):
+    """Returns the string of a unit raised to an exponent."""
+    if exponent == 1:
+        return "{}".format(unit)
+    elif type(exponent) is int:
+        return "{}^{}".format(unit, exponent)
+    return "{}^({})".format(unit, exponent)
+
+
+# Replacements of the symbols which are not ASCII, the results can be parsed
+_ascii_symbols = str.maketrans({"Ω": "Ohm", "µ": "u"})
+
+_superscripts = str.maketrans("0123456789-/", "⁰¹²³⁴⁵⁶⁷⁸⁹⁻ᐟ")
+
+_latex_symbols = str.maketrans({"Ω": r"\Omega", "µ": r"\mu "})
+
+
+def _format_ascii_power(unit, exponent):
+    """Returns the ASCII string of a unit raised to an exponent."""
+    return _format_power("{}".format(unit).translate(_ascii_symbols),
+                         exponent)
+
+
+def _format_superscript(unit, exponent):
+    """Returns the string of a unit raised to an exponent in
+    superscript."""
+    if exponent == 1:
+        return "{}".format(unit)
+    return "{}{}".format(unit, str(exponent).translate(_superscripts))
+
+
+def _format_latex(numerators, denominators):
+    """Converts pairs of unit and exponent into a LaTeX fraction."""
+    strings = []
+    for items in (numerators, denominators):
+        powers = []
+        for unit, exponent in items:
+            string = "{}".format(unit).translate(_latex_symbols)
+            if not string.isdigit():
+                string = r"\mathrm{{{}}}".format(string)
+            if exponent != 1:
+                string += "^{{{}}}".format(exponent)
+            powers.append(string)
+        strings.append(r" \cdot ".join(powers))
+    if not strings[1]:
+        return strings[0] or "1"
+    return r"\frac{{{}}}{{{}}}".format(strings[0] or "1", strings[1])
+
+
+# Formatter of a unit raised to an exponent and separator between the units
+# of every style
+_styles = {"repr": (_format_power, "*"),
+           "ascii": (_format_ascii_power, "*"),
+           "unicode": (_format_superscript, "·")}
+
+
+@lru_cache(maxsize=4096)
+def _render(reduced, scale, style):
+    """Returns the string of a representation in an output style."""
+    if scale:
+        return format_prefixed(reduced, scale, style)
+    return format_fraction([(unit, exponent) for unit, exponent in reduced
+                            if exponent > 0],
+                           [(unit, -exponent) for unit, exponent in reduced
+                            if exponent < 0], style)
+
+
 def check_divider(numerators_0, denominators_0, numerators_1,
                   denominators_1):
     """Returns whether the first fraction divides the second fraction.
@@ -416,3 +2115,126 @@ def check_exact_match(numerators_0, denominators_0, numerators_1,
     if tmp_denom:
         equal = False
     return equal
+
+
+_token_pattern = re.compile(r"\s*(?:(\d+)|([^\W\d_]+)|(\S))")
+
+
+@lru_cache(maxsize=4096)
+def tokenize(string):
+    """Splits a unit expression into a tuple of tokens.
+
+    Args:
+        string (str): Unit expression.
+    """
+    tokens = []
+    position = 0
+    string = string.rstrip()
+    while position < len(string):
+        match = _token_pattern.match(string, position)
+        number, symbol, operator = match.groups()
+        if number is not None:
+            tokens.append(int(number))
+        elif symbol is not None:
+            tokens.append(symbol)
+        elif operator in "*/^()-":
+            tokens.append(operator)
+        else:
+            raise ValueError("Unexpected character '{}' in unit '{}'".format(
+                operator, string))
+        position = match.end()
+    return tuple(tokens)
+
+
+def parse_dimension(string):
+    """Returns the dimension vector of a unit expression of the default
+    registry. Prefixes are ignored.
+
+    Args:
+        string (str): Unit expression like ``"(m*kg)/(s^3*A)"``.
+    """
+    return default_registry.parse_dimension(string)
+
+
+class _Parser:
+    """Recursive descent parser for unit expressions."""
+
+    def __init__(self, tokens, string, registry):
+        self.tokens = tokens
+        self.string = string
+        self.registry = registry
+        self.position = 0
+
+    def fail(self):
+        raise ValueError("Cannot parse unit '{}'".format(self.string))
+
+    def peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+
+    def take(self):
+        token = self.peek()
+        if token is None:
+            self.fail()
+        self.position += 1
+        return token
+
+    def expression(self):
+        dimension, scale = self.power()
+        while self.peek() in ("*", "/"):
+            sign = 1 if self.take() == "*" else -1
+            other_dimension, other_scale = self.power()
+            dimension = tuple(x + sign * y
+                              for x, y in zip(dimension, other_dimension))
+            scale = scale + sign * other_scale
+        return dimension, scale
+
+    def power(self):
+        dimension, scale = self.factor()
+        if self.peek() == "^":
+            self.take()
+            exponent = self.exponent()
+            dimension = tuple(_normalize_exponent(x * exponent)
+                              for x in dimension)
+            scale = _normalize_exponent(scale * exponent)
+        return dimension, scale
+
+    def factor(self):
+        token = self.take()
+        if token == "(":
+            dimension = self.expression()
+            if self.take() != ")":
+                self.fail()
+            return dimension
+        if isinstance(token, int):
+            # Powers of ten like 1, 10 or 1000
+            digits = str(token)
+            if digits.strip("0") == "1" and digits[0] == "1":
+                return (0,) * len(base_units), len(digits) - 1
+        elif isinstance(token, str):
+            symbol = self.registry.symbols.get(token)
+            if symbol is not None:
+                return symbol
+        self.fail()
+
+    def exponent(self):
+        token = self.take()
+        if token == "(":
+            exponent = self.exponent()
+            if self.peek() == "/":
+                self.take()
+                denominator = self.take()
+                if not isinstance(denominator, int) or not denominator:
+                    self.fail()
+                exponent = _normalize_exponent(Fraction(exponent,
+                                                        denominator))
+            if self.take() != ")":
+                self.fail()
+            return exponent
+        sign = 1
+        if token == "-":
+            sign = -1
+            token = self.take()
+        if not isinstance(token, int):
+            self.fail()
+        return sign * token